@@ -0,0 +1,89 @@
+# Vergleicht das alte Laden (sqlite3.Row -> dict -> Customer mit __dict__) mit
+# CustomerManager.get_all_customers (Row-Factory, Customer mit __slots__)
+# Aufruf im Projekt-Root: python -m Benchmarks.bench_customer_load [anzahl]
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Data.Mssql import sql_commands as sql
+from Manager.customer_manager import CustomerManager
+
+
+class LegacyCustomer:
+    # Stand vor __slots__: jedes Objekt trägt ein eigenes __dict__
+    def __init__(self, id, date="", lastName="", firstName="", birthDate="",
+                 address="", telephoneNumber="", email="", insurance="",
+                 doctor="", pretreatment="", reason=""):
+        self.id = id
+        self.date = date
+        self.lastName = lastName
+        self.firstName = firstName
+        self.birthDate = birthDate
+        self.address = address
+        self.telephoneNumber = telephoneNumber
+        self.email = email
+        self.insurance = insurance
+        self.doctor = doctor
+        self.pretreatment = pretreatment
+        self.reason = reason
+
+
+def load_customers_legacy(conn):
+    # Früher "SELECT *"; die Spaltenliste ist fest, weil die Tabelle inzwischen Zusatzspalten hat
+    cursor = conn.execute(sql.SELECT_ALL_CUSTOMERS)
+    return [LegacyCustomer(**row) for row in map(dict, cursor.fetchall())]
+
+
+def _fill(manager, count):
+    records = ({
+        "date": "2024-01-01", "lastName": f"Nachname{i}", "firstName": f"Vorname{i}",
+        "birthDate": "1980-05-17", "address": f"Hauptstraße {i % 200}, 12345 Berlin",
+        "telephoneNumber": f"0301234{i:05d}", "email": f"kunde{i}@example.de",
+        "insurance": "AOK", "doctor": "Dr. Schmidt", "pretreatment": "", "reason": "Kontrolle",
+    } for i in range(count))
+    manager.bulk_insert(records, batch_size=5000)
+
+
+def _measure(loader):
+    loader()  # Page-Cache aufwärmen
+    gc.collect()
+    start = time.perf_counter()
+    customers = loader()
+    elapsed = time.perf_counter() - start
+    del customers
+
+    gc.collect()
+    tracemalloc.start()
+    customers = loader()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del customers
+    return {"seconds": elapsed, "retained_bytes": current, "peak_bytes": peak}
+
+
+def run(count=500_000):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CustomerManager(os.path.join(tmp, "bench.db"))
+        _fill(manager, count)
+        legacy_conn = sqlite3.connect(manager.db_path)
+        legacy_conn.row_factory = sqlite3.Row
+
+        for name, loader in (("alt", lambda: load_customers_legacy(legacy_conn)),
+                             ("slots", manager.get_all_customers)):
+            result = _measure(loader)
+            result.update(rows=count, loader=name)
+            results.append(result)
+            print(f"{count} Zeilen  {name:<5} {result['seconds']:6.2f} s  "
+                  f"Liste {result['retained_bytes'] / 1e6:7.1f} MB  Spitze {result['peak_bytes'] / 1e6:7.1f} MB")
+        legacy_conn.close()
+        manager.close()
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,55 @@
+# Vergleicht den alten Word-Export (add_row()/cell.text je Zelle) mit dem XML-Streaming-Export
+# Aufruf im Projekt-Root: python -m Benchmarks.bench_docx_export [anzahl ...]
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from Benchmarks.bench_customer_load import _fill
+from Manager.customer_manager import CustomerManager
+from Utils.exporters import FIELDS, export_docx
+
+
+def export_docx_legacy(path, customers):
+    # Stand vor dem Streaming-Export
+    from docx import Document
+    data = list(customers)
+    doc = Document()
+    if not data:
+        doc.add_paragraph("Keine Daten")
+    else:
+        table = doc.add_table(rows=1, cols=len(FIELDS))
+        hdr_cells = table.rows[0].cells
+        for i, key in enumerate(FIELDS):
+            hdr_cells[i].text = key
+        for c in data:
+            row_cells = table.add_row().cells
+            for i, key in enumerate(FIELDS):
+                row_cells[i].text = str(getattr(c, key))
+    doc.save(path)
+
+
+def run(counts=(5_000, 50_000)):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CustomerManager(os.path.join(tmp, "bench.db"))
+        filled = 0
+        for count in sorted(counts):
+            _fill(manager, count - filled)
+            filled = count
+            for name, exporter in (("alt", export_docx_legacy), ("xml", export_docx)):
+                path = os.path.join(tmp, f"{name}.docx")
+                gc.collect()
+                start = time.perf_counter()
+                exporter(path, manager.iter_customers())
+                elapsed = time.perf_counter() - start
+                result = {"rows": count, "exporter": name, "seconds": elapsed, "file_bytes": os.path.getsize(path)}
+                results.append(result)
+                print(f"{count:>7} Zeilen  {name:<4} {elapsed:8.2f} s  Datei {result['file_bytes'] / 1e6:6.1f} MB")
+        manager.close()
+    return results
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (5_000, 50_000))
@@ -0,0 +1,69 @@
+# Vergleicht den alten Excel-Export (normales Workbook) mit dem Streaming-Export (write_only)
+# Aufruf im Projekt-Root: python -m Benchmarks.bench_excel_export [anzahl ...]
+# Ohne lxml schreibt openpyxl über den langsameren Standard-XML-Writer (mit OPENPYXL_LXML=False nachstellbar).
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Benchmarks.bench_customer_load import _fill
+from Manager.customer_manager import CustomerManager
+from Utils.exporters import FIELDS, export_excel
+
+
+def export_excel_legacy(path, customers):
+    # Stand vor dem Streaming-Export: alle Zellen liegen bis zum Speichern im Speicher
+    from openpyxl import Workbook
+    data = list(customers)
+    wb = Workbook()
+    ws = wb.active
+    if not data:
+        ws.append(["Keine Daten"])
+    else:
+        ws.append(list(FIELDS))
+        for c in data:
+            ws.append([getattr(c, k) for k in FIELDS])
+    wb.save(path)
+
+
+def _measure(exporter, manager, path, repeat=1):
+    # Zeit ohne, Speicher mit tracemalloc (sonst verfälscht der Overhead die Zeit)
+    elapsed = float("inf")
+    for _ in range(repeat):  # Bestwert, einzelne Läufe streuen um bis zu 20 %
+        gc.collect()
+        start = time.perf_counter()
+        exporter(path, manager.iter_customers())
+        elapsed = min(elapsed, time.perf_counter() - start)
+    size = os.path.getsize(path)
+
+    gc.collect()
+    tracemalloc.start()
+    exporter(path, manager.iter_customers())
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak, "file_bytes": size}
+
+
+def run(counts=(10_000, 100_000, 500_000)):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CustomerManager(os.path.join(tmp, "bench.db"))
+        filled = 0
+        for count in sorted(counts):
+            _fill(manager, count - filled)  # Datenbank schrittweise auf die nächste Größe auffüllen
+            filled = count
+            for name, exporter in (("alt", export_excel_legacy), ("write_only", export_excel)):
+                result = _measure(exporter, manager, os.path.join(tmp, f"{name}.xlsx"),
+                                  repeat=3 if count <= 100_000 else 1)
+                result.update(rows=count, exporter=name)
+                results.append(result)
+                print(f"{count:>7} Zeilen  {name:<10} {result['seconds']:7.2f} s  "
+                      f"Spitze {result['peak_bytes'] / 1e6:8.1f} MB  Datei {result['file_bytes'] / 1e6:6.1f} MB")
+        manager.close()
+    return results
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (10_000, 100_000, 500_000))
@@ -0,0 +1,39 @@
+# Vergleicht die Paragraph-Tabelle (bisheriges generate_pdf) mit dem schnellen Canvas-Modus
+# Aufruf im Projekt-Root: python -m Benchmarks.bench_pdf_render [anzahl ...]
+import gc
+import io
+import sys
+import time
+
+from Frontend.constants import labels
+from Utils.pdf_render import render_table_pdf
+
+
+def make_rows(count):
+    # Zeilen wie im Treeview (MainWindow._row_values), mit gelegentlich langen Texten
+    return [[
+        i, "02.01.2024", f"Nachname{i}", f"Vorname{i}", "17.05.1980",
+        f"Hauptstraße {i % 200}, 12345 Berlin", f"0301234{i:05d}", f"kunde{i}@example.de",
+        "AOK", "Dr. Schmidt", "Knie-OP, Physiotherapie über mehrere Wochen" if i % 7 == 0 else "",
+        "Kontrolle",
+    ] for i in range(count)]
+
+
+def run(counts=(1_000, 10_000, 50_000)):
+    results = []
+    for count in counts:
+        rows = make_rows(count)
+        for name, fast in (("paragraph", False), ("canvas", True)):
+            gc.collect()
+            out = io.BytesIO()
+            start = time.perf_counter()
+            render_table_pdf(out, labels, rows, fast=fast)
+            elapsed = time.perf_counter() - start
+            result = {"rows": count, "mode": name, "seconds": elapsed, "pdf_bytes": out.tell()}
+            results.append(result)
+            print(f"{count:>6} Zeilen  {name:<9} {elapsed:7.2f} s  PDF {result['pdf_bytes'] / 1e6:6.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (1_000, 10_000, 50_000))
@@ -0,0 +1,114 @@
+# Deterministische Testpatienten (gleicher seed -> gleiche Daten, die ersten n Zeilen hängen nicht von count ab)
+# Aufruf im Projekt-Root: python -m Benchmarks.fake_patients anzahl datei.json [seed]
+import datetime
+import json
+import random
+import sys
+
+FIRST_NAMES = (
+    "Anna", "Emma", "Mia", "Sophie", "Marie", "Lena", "Hannah", "Lea", "Johanna", "Clara",
+    "Ursula", "Renate", "Monika", "Petra", "Sabine", "Gabriele", "Brigitte", "Karin", "Jürgen", "Jörg",
+    "Lukas", "Leon", "Paul", "Jonas", "Felix", "Maximilian", "Elias", "Noah", "Ben", "Finn",
+    "Peter", "Klaus", "Wolfgang", "Michael", "Thomas", "Andreas", "Stefan", "Uwe", "Dieter", "Günter",
+    "Özlem", "Ayşe", "Mehmet", "Zoë", "Björn", "Søren", "Chantal", "Jean-Luc", "Anne-Kathrin", "Karl-Heinz",
+)
+LAST_NAMES = (
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann",
+    "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+    "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Schmitz", "Krause", "Meier",
+    "Lehmann", "Schmid", "Schulze", "Maier", "Köhler", "Herrmann", "König", "Walter", "Mayer", "Huber",
+    "Kaiser", "Fuchs", "Peters", "Lang", "Scholz", "Möller", "Weiß", "Jung", "Hahn", "Schubert",
+    "Yılmaz", "Kowalski", "Nguyen", "von Bülow", "Meyer-Lüdenscheidt", "Groß", "Vogel", "Friedrich", "Keller", "Günther",
+)
+STREETS = (
+    "Hauptstraße", "Schulstraße", "Gartenstraße", "Bahnhofstraße", "Dorfstraße", "Bergstraße", "Birkenweg",
+    "Lindenstraße", "Kirchstraße", "Waldstraße", "Ringstraße", "Goethestraße", "Schillerstraße", "Am Markt",
+    "Mühlenweg", "Friedrich-Ebert-Straße", "Rosenstraße", "Jahnstraße", "Wiesenweg", "Kastanienallee",
+)
+# (PLZ-Bereich, Ort, Vorwahl)
+CITIES = (
+    ((10115, 14199), "Berlin", "030"), ((20095, 22769), "Hamburg", "040"), ((80331, 81929), "München", "089"),
+    ((50667, 51149), "Köln", "0221"), ((60306, 60599), "Frankfurt am Main", "069"), ((70173, 70629), "Stuttgart", "0711"),
+    ((40210, 40629), "Düsseldorf", "0211"), ((44135, 44388), "Dortmund", "0231"), ((45127, 45359), "Essen", "0201"),
+    ((4103, 4357), "Leipzig", "0341"), ((28195, 28779), "Bremen", "0421"), ((1067, 1328), "Dresden", "0351"),
+    ((30159, 30669), "Hannover", "0511"), ((90402, 90491), "Nürnberg", "0911"), ((33602, 33739), "Bielefeld", "0521"),
+    ((97070, 97084), "Würzburg", "0931"), ((24103, 24159), "Kiel", "0431"), ((18055, 18147), "Rostock", "0381"),
+)
+MOBILE_PREFIXES = ("0151", "0152", "0157", "0160", "0162", "0170", "0171", "0172", "0176", "0177", "0179")
+MAIL_DOMAINS = ("web.de", "gmx.de", "gmail.com", "t-online.de", "posteo.de", "outlook.de", "freenet.de")
+INSURANCES = (
+    "AOK", "AOK Bayern", "Techniker Krankenkasse", "Barmer", "DAK-Gesundheit", "IKK classic",
+    "KKH", "hkk", "BKK firmus", "Knappschaft", "Privat", "Debeka", "Allianz Private",
+)
+DOCTORS = ("Dr. med. Schulte", "Dr. Yıldız", "Dr. med. Hoffmann-Berg", "Praxis am Markt", "Dr. Weiß",
+           "MVZ Nord", "Dr. med. Nguyen", "Dr. König", "")
+PRETREATMENTS = ("", "", "", "Physiotherapie", "Knie-OP 2019", "Bandscheibenvorfall L4/L5, konservativ behandelt",
+                 "Hüft-TEP links", "Manuelle Therapie, 6 Termine", "Schulter-Arthroskopie rechts")
+REASONS = ("Kontrolle", "Erstgespräch", "Rückenschmerzen", "Nachsorge", "Nackenverspannung",
+           "Sportverletzung Sprunggelenk", "Rezept Krankengymnastik", "Beratung", "Kopfschmerzen seit drei Wochen")
+
+_MAIL_CHARS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "ı": "i", "ş": "s", "ø": "o", "ë": "e",
+                             " ": "", "-": ""})
+
+
+def _phone(rng, prefix):
+    # Gängige Schreibweisen gemischt: "030 1234567", "030/1234567", "+49 30 1234567", Mobilnummern
+    style = rng.random()
+    if style < 0.35:
+        prefix = rng.choice(MOBILE_PREFIXES)
+        number = f"{rng.randrange(1000000, 99999999)}"
+    else:
+        number = f"{rng.randrange(100000, 9999999)}"
+    if style < 0.55:
+        return f"{prefix} {number}"
+    if style < 0.75:
+        return f"{prefix}/{number}"
+    if style < 0.9:
+        return f"+49 {prefix[1:]} {number}"
+    return f"{prefix}-{number[:3]} {number[3:]}"
+
+
+def _date(rng, start, days):
+    return (start + datetime.timedelta(days=rng.randrange(days))).strftime("%d.%m.%Y")
+
+
+def generate_patients(count, seed=42):
+    # Datensätze wie beim JSON-Import (Datumsangaben TT.MM.JJJJ, wie sie Benutzer eintippen)
+    rng = random.Random(seed)
+    visit_start = datetime.date(2018, 1, 1)
+    birth_start = datetime.date(1930, 1, 1)
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        (plz_from, plz_to), city, prefix = rng.choice(CITIES)
+        mail_name = f"{first}.{last}".lower().translate(_MAIL_CHARS)
+        yield {
+            "date": _date(rng, visit_start, 3000),
+            "lastName": last,
+            "firstName": first,
+            "birthDate": _date(rng, birth_start, 30000),
+            "address": f"{rng.choice(STREETS)} {rng.randrange(1, 180)}{rng.choice(('', '', '', 'a', 'b'))}, "
+                       f"{rng.randrange(plz_from, plz_to + 1):05d} {city}",
+            "telephoneNumber": _phone(rng, prefix),
+            "email": f"{mail_name}{rng.randrange(100) if rng.random() < 0.6 else ''}@{rng.choice(MAIL_DOMAINS)}",
+            "insurance": rng.choice(INSURANCES),
+            "doctor": rng.choice(DOCTORS),
+            "pretreatment": rng.choice(PRETREATMENTS),
+            "reason": rng.choice(REASONS),
+        }
+
+
+def write_json(path, count, seed=42):
+    # Importdatei im Format des JSON-Exports, Element für Element geschrieben
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        sep = "\n"
+        for record in generate_patients(count, seed):
+            f.write(sep)
+            f.write(json.dumps(record, ensure_ascii=False))
+            sep = ",\n"
+        f.write("\n]")
+
+
+if __name__ == "__main__":
+    write_json(sys.argv[2], int(sys.argv[1]), int(sys.argv[3]) if len(sys.argv) > 3 else 42)
@@ -0,0 +1,235 @@
+# Benchmark-Suite ohne Tk: Datenbank, Suche, Import, alle Exporter und das Druck-PDF mit Testpatienten
+# Aufruf im Projekt-Root: python -m Benchmarks.suite --rows 10000 --output neu.json --baseline alt.json
+# Ergebnis ist eine JSON-Datei; mit --baseline wird verglichen und bei Regressionen mit Code 1 beendet,
+# ebenso bei unerwarteten Tabellen-Scans laut query_audit, wenn der Kunden-Cache nicht greift
+# und wenn der JSON-Stream-Leser an Blockgrenzen falsch liest.
+import argparse
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from Benchmarks.fake_patients import generate_patients, write_json
+from Data.Mssql import query_audit
+from Frontend.constants import labels, label_to_attr
+from Manager.customer_manager import CustomerManager
+from Utils.exporters import EXPORTERS
+from Utils.json_stream import JsonArrayReader, iter_json_array
+from Utils.pdf_render import render_table_pdf
+from Utils.validierung import fmt_de_date
+
+# Regression: langsamer als Referenz * (1 + Toleranz) + MIN_SLACK_SECONDS (kleine Zeiten schwanken stark)
+DEFAULT_TOLERANCE = 0.25
+TOLERANCES = {"add_customer": 0.5, "search_customers": 0.5, "search_phonetic": 0.5}
+MIN_SLACK_SECONDS = 0.05
+
+# Fälle mit Obergrenze, sonst dauert ein Lauf mit 1 Mio. Zeilen Stunden
+# (Einzel-Inserts committen je Zeile, der PDF-Export setzt eine einzige platypus-Tabelle)
+CASE_MAX_ROWS = {"add_customer": 2_000, "export_pdf": 5_000, "print_pdf": 20_000}
+# Zahlen, die an Blockgrenzen abgeschnitten werden können ("-0" + ".5")
+JSON_STREAM_SAMPLES = (b'[-0.5]', b'[100000.0]', b'[1e5, 2E-3, -12.75e+2, 0, true, null, "x", {"a": 1.5}]')
+JSON_STREAM_CHUNK_SIZES = (1, 2, 3, 5, 7, 11, 64)
+SEARCH_QUERIES = ("Müller", "berlin", "0171", "Jürgen Schmidt", "physio", "xyz-kein-treffer")
+PHONETIC_QUERIES = ("Meyer", "Schmitt", "Müler", "Hans Maier", "Jürgen Schmid", "Xyzzy")
+
+
+def _add_customer(ctx, rows):
+    for record in generate_patients(rows, ctx["seed"] + 1):
+        ctx["manager"].add_customer(**record)
+
+
+def _bulk_insert(ctx, rows):
+    ctx["manager"].bulk_insert(generate_patients(rows, ctx["seed"]), batch_size=5000)
+
+
+def _query_plan(ctx, rows):
+    # Kein Zeitfall im eigentlichen Sinn: unerwartete Scans auf großen Tabellen lassen die Suite scheitern
+    # (bei kleinen Läufen zählt schon die Testtabelle als groß, damit auch schnelle Läufe den Plan prüfen)
+    results = query_audit.audit_database(ctx["manager"].db_path, log=None, time_queries=False)
+    ctx["plan_findings"] = [f"{r['name']}: {'; '.join(r['issues'])}"
+                            for r in query_audit.unexpected(results, min(rows, query_audit.LARGE_TABLE_ROWS))]
+
+
+def _cache_identity(ctx, rows):
+    # Schreiben über den Manager pflegt den Cache: danach Treffer mit demselben Objekt
+    manager = ctx["manager"]
+    findings = ctx["cache_findings"]
+    for name, write in (
+        ("add_customer", lambda: manager.add_customer(**next(generate_patients(1, ctx["seed"] + 2)))),
+        ("update_customer", lambda: manager.update_customer(1, **next(generate_patients(1, ctx["seed"] + 3)))),
+    ):
+        customer = write()
+        hits = manager.cache_stats()["hits"]
+        loaded = manager.get_customer_by_id(customer.id)
+        if manager.cache_stats()["hits"] != hits + 1:
+            findings.append(f"{name}: get_customer_by_id danach ist kein Cache-Treffer")
+        if loaded is not customer:
+            findings.append(f"{name}: get_customer_by_id liefert ein anderes Objekt")
+
+
+def _json_stream(ctx, rows):
+    # Kein Zeitfall: JsonArrayReader muss bei jeder Blockgröße dasselbe liefern wie json.loads
+    for data in JSON_STREAM_SAMPLES:
+        expected = json.loads(data)
+        for chunk_size in JSON_STREAM_CHUNK_SIZES:
+            try:
+                got = list(iter_json_array(io.BytesIO(data), chunk_size))
+            except ValueError as e:
+                got = f"Fehler: {e}"
+            if got != expected:
+                ctx["json_findings"].append(f"{data!r} bei Blockgröße {chunk_size}: {got!r}")
+
+
+def _get_all_customers(ctx, rows):
+    ctx["manager"].get_all_customers()
+
+
+def _search_customers(ctx, rows):
+    for query in SEARCH_QUERIES:
+        ctx["manager"].search_customers(query)
+
+
+def _search_phonetic(ctx, rows):
+    for query in PHONETIC_QUERIES:
+        ctx["manager"].search_customers_phonetic(query)
+
+
+def _json_import(ctx, rows):
+    # Wie ImportWindow._run_import, in eine leere Datenbank
+    manager = CustomerManager(os.path.join(ctx["tmp"], "import.db"))
+    try:
+        with open(ctx["json_path"], "rb") as f:
+            manager.bulk_insert(JsonArrayReader(f), atomic=True)
+    finally:
+        manager.close()
+
+
+def _exporter(fmt):
+    def run(ctx, rows):
+        # Wie ExportWindow: Kunden kommen blockweise aus iter_customers
+        customers = ctx["manager"].iter_customers()
+        if rows < ctx["rows"]:
+            customers = ctx["manager"].get_customers_page(limit=rows)
+        EXPORTERS[fmt](os.path.join(ctx["tmp"], f"export.{fmt}"), customers)
+    return run
+
+
+def _print_pdf(ctx, rows):
+    # Was PrintWindow.generate_pdf im PDF-Prozess rendert: sichtbare Tabellenzeilen mit deutschen Datumsangaben
+    def value(customer, col):
+        val = getattr(customer, label_to_attr[col])
+        return fmt_de_date(val) if col in ("Geburtstag", "Datum") else val
+    customers = ctx["manager"].get_customers_page(limit=rows)
+    render_table_pdf(os.path.join(ctx["tmp"], "print.pdf"), labels,
+                     [[value(c, col) for col in labels] for c in customers])
+
+
+# Reihenfolge zählt: bulk_insert füllt die Datenbank für alle folgenden Fälle
+CASES = [
+    ("bulk_insert", _bulk_insert),
+    ("query_plan", _query_plan),
+    ("cache_identity", _cache_identity),
+    ("json_stream", _json_stream),
+    ("get_all_customers", _get_all_customers),
+    ("search_customers", _search_customers),
+    ("search_phonetic", _search_phonetic),
+    ("json_import", _json_import),
+] + [(f"export_{fmt}", _exporter(fmt)) for fmt in EXPORTERS] + [
+    ("print_pdf", _print_pdf),
+    ("add_customer", _add_customer),
+]
+
+
+def run(rows=10_000, seed=42, only=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = {"tmp": tmp, "rows": rows, "seed": seed, "json_path": os.path.join(tmp, "import.json"),
+               "plan_findings": [], "cache_findings": [], "json_findings": []}
+        write_json(ctx["json_path"], rows, seed)
+        ctx["manager"] = CustomerManager(os.path.join(tmp, "bench.db"))
+        try:
+            for name, case in CASES:
+                if only and name not in only and name not in ("bulk_insert", "query_plan", "cache_identity",
+                                                                "json_stream"):
+                    continue
+                case_rows = min(rows, CASE_MAX_ROWS.get(name, rows))
+                gc.collect()
+                start = time.perf_counter()
+                case(ctx, case_rows)
+                elapsed = time.perf_counter() - start
+                results[name] = {"rows": case_rows, "seconds": round(elapsed, 4)}
+                print(f"{name:<20} {case_rows:>8} Zeilen  {elapsed:8.3f} s")
+        finally:
+            ctx["manager"].close()
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rows": rows,
+        "seed": seed,
+        "results": results,
+        "query_plan_findings": ctx["plan_findings"],
+        "cache_findings": ctx["cache_findings"],
+        "json_findings": ctx["json_findings"],
+    }
+
+
+def compare(current, baseline, tolerance=None):
+    # Liste der Regressionen als Text; Fälle mit anderer Zeilenzahl werden nicht verglichen
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None or old["rows"] != result["rows"]:
+            continue
+        allowed = old["seconds"] * (1 + (tolerance if tolerance is not None else TOLERANCES.get(name, DEFAULT_TOLERANCE)))
+        change = (result["seconds"] / old["seconds"] - 1) * 100 if old["seconds"] else 0.0
+        print(f"{name:<20} {old['seconds']:8.3f} s -> {result['seconds']:8.3f} s  ({change:+.0f} %)")
+        if result["seconds"] > allowed + MIN_SLACK_SECONDS:
+            regressions.append(f"{name}: {old['seconds']:.3f} s -> {result['seconds']:.3f} s ({change:+.0f} %)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="sweetNote Benchmark-Suite")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument("--tolerance", type=float, help="erlaubte Verlangsamung für alle Fälle, z.B. 0.25")
+    parser.add_argument("--only", nargs="*", help="nur diese Fälle (bulk_insert und die Prüffälle laufen immer)")
+    args = parser.parse_args(argv)
+
+    current = run(args.rows, args.seed, args.only)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"Ergebnisse: {args.output}")
+
+    failed = False
+    if current["query_plan_findings"]:
+        print("Unerwartete Scans/Sortierungen (Data/Mssql/query_audit.py):\n  " + "\n  ".join(current["query_plan_findings"]))
+        failed = True
+    if current["cache_findings"]:
+        print("Kunden-Cache:\n  " + "\n  ".join(current["cache_findings"]))
+        failed = True
+    if current["json_findings"]:
+        print("JSON-Stream:\n  " + "\n  ".join(current["json_findings"]))
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print("Regressionen:\n  " + "\n  ".join(regressions))
+            return 1
+        print("Keine Regressionen.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
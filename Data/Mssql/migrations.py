@@ -0,0 +1,126 @@
+import inspect
+
+from Data.Mssql import sql_commands as sql
+from Utils.phonetik import koelner_phonetik
+from Utils.validierung import to_iso_date
+
+# Versionierte Schema-Migrationen über PRAGMA user_version.
+# Jede Stufe läuft in einer eigenen Transaktion, user_version wird in derselben Transaktion gesetzt:
+# bricht der Start ab, fehlt die Stufe komplett und wird beim nächsten Start wiederholt.
+# Stufen mit viel Datenarbeit sind Generatoren; nach jedem yield wird der Block committet.
+# Solche Stufen müssen idempotent sein, damit ein Neustart einfach dort weitermacht.
+BATCH_ROWS = 20_000
+
+MIGRATIONS = []
+
+
+def migration(version):
+    def register(step):
+        MIGRATIONS.append((version, step))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return step
+    return register
+
+
+def latest_version():
+    return MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, progress=None):
+    # conn: Schreibverbindung (sqlite3, isolation_level wie im CustomerManager)
+    # progress(version, erledigt, gesamt) nach jedem Block einer Datenmigration
+    conn.commit()
+    for version, step in MIGRATIONS:
+        if version <= current_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Ein zweiter Prozess kann die Stufe inzwischen erledigt haben
+            if version <= current_version(conn):
+                conn.rollback()
+                continue
+            result = step(conn)
+            if inspect.isgenerator(result):
+                for done, total in result:
+                    conn.commit()
+                    if progress:
+                        progress(version, done, total)
+                    conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return current_version(conn)
+
+
+@migration(1)
+def _base_schema(conn):
+    # Ausgangsstand; bestehende Datenbanken (user_version 0) haben ihn meist schon
+    conn.execute(sql.CREATE_CUSTOMER_TABLE)
+    for stmt in sql.CREATE_BASE_INDEXES:
+        conn.execute(stmt)
+
+
+@migration(2)
+def _iso_dates(conn):
+    # Gleiche Regeln wie beim Speichern (to_iso_date); Unlesbares bleibt unverändert
+    last_id = conn.execute(sql.MAX_CUSTOMER_ID).fetchone()[0]
+    for after in range(0, last_id, BATCH_ROWS):
+        rows = conn.execute(sql.SELECT_DATES_TO_NORMALIZE, {"after": after, "until": after + BATCH_ROWS})
+        changed = []
+        for id, date, birth_date in rows.fetchall():
+            iso_date, iso_birth = to_iso_date(date), to_iso_date(birth_date)
+            if (iso_date, iso_birth) != (date, birth_date):
+                changed.append({"id": id, "date": iso_date, "birthDate": iso_birth})
+        conn.executemany(sql.SET_DATES, changed)
+        yield min(after + BATCH_ROWS, last_id), last_id
+
+
+@migration(3)
+def _sort_indexes(conn):
+    for name, key in sql.SORT_KEYS.items():
+        if name != "id":
+            conn.execute(sql.CREATE_SORT_INDEX.format(name=name, key=key))
+
+
+@migration(4)
+def _normalized_columns(conn):
+    existing = {row[0] for row in conn.execute(sql.TABLE_COLUMNS)}
+    for name, expr in sql.NORMALIZED_COLUMNS.items():
+        if name not in existing:
+            conn.execute(sql.ADD_GENERATED_COLUMN.format(name=name, expr=expr))
+    for stmt in sql.CREATE_NORMALIZED_INDEXES:
+        conn.execute(stmt)
+
+
+@migration(5)
+def _phonetic_keys(conn):
+    # Nur Zeilen ohne Schlüssel: nach einem Abbruch geht es beim nächsten Start dort weiter
+    existing = {row[0] for row in conn.execute(sql.TABLE_COLUMNS)}
+    for name in sql.PHONETIC_COLUMNS:
+        if name not in existing:
+            conn.execute(sql.ADD_COLUMN.format(name=name))
+    # Der FTS-Trigger wird beim Start mit Spaltenliste neu angelegt und bleibt beim Nachfüllen still
+    conn.execute(sql.DROP_FTS_UPDATE_TRIGGER)
+    last_id = conn.execute(sql.MAX_CUSTOMER_ID).fetchone()[0]
+    for after in range(0, last_id, BATCH_ROWS):
+        rows = conn.execute(sql.SELECT_NAMES_WITHOUT_PHONETIC, {"after": after, "until": after + BATCH_ROWS})
+        conn.executemany(sql.SET_PHONETIC_KEYS, [
+            {"id": id, "lastName_phon": koelner_phonetik(last), "firstName_phon": koelner_phonetik(first)}
+            for id, last, first in rows.fetchall()
+        ])
+        yield min(after + BATCH_ROWS, last_id), last_id
+    # Indizes erst nach dem Füllen, das ist deutlich schneller
+    for stmt in sql.CREATE_PHONETIC_INDEXES:
+        conn.execute(stmt)
+
+
+@migration(6)
+def _iso_dates_short(conn):
+    # Stufe 2 erkannte anfangs nur TT.MM.JJJJ; Datenbanken von damals haben z.B. 1.2.2024 noch mit Punkten
+    yield from _iso_dates(conn)
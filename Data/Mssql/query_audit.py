@@ -0,0 +1,169 @@
+# Prüft per EXPLAIN QUERY PLAN, wie SQLite die Anweisungen aus sql_commands ausführt.
+# Auffällig: Tabellen-Scans (außer geordnete Scans mit LIMIT, die früh abbrechen) und temporäre B-Bäume zum Sortieren.
+# Aufruf im Projekt-Root: python -m Data.Mssql.query_audit [datenbank]  (Exit-Code 1 bei unerwarteten Befunden)
+import pathlib
+import re
+import sqlite3
+import sys
+import time
+
+from Data.Mssql import sql_commands as sql
+
+# Ab dieser Zeilenzahl gilt eine Tabelle als groß (Benchmark-Suite schlägt dann fehl)
+LARGE_TABLE_ROWS = 10_000
+
+# Bekannte Scans/Sortierungen mit Begründung; Schlüssel ist der Name ohne [Variante]
+EXPECTED = {
+    "SELECT_ALL_CUSTOMERS": "liest bewusst alle Kunden",
+    "SELECT_ALL_CUSTOMERS_ORDERED": "liest bewusst alle Kunden (in Indexreihenfolge)",
+    "COUNT_CUSTOMERS": "COUNT(*) ohne WHERE zählt immer alle Zeilen",
+    "SEARCH_CUSTOMERS_LIKE": "LIKE-Fallback ohne FTS5: '%…%' kann keinen Index nutzen",
+    "COUNT_SEARCH_CUSTOMERS_LIKE": "LIKE-Fallback ohne FTS5: '%…%' kann keinen Index nutzen",
+    "SEARCH_CUSTOMERS_ORDERED": "sortiert nur die Treffer aus dem FTS-Index",
+    "SEARCH_CUSTOMERS_PHONE": "sortiert nur die Treffer aus dem Index auf phone_digits",
+    "DELETE_ALL_CUSTOMERS": "löscht bewusst alle Kunden",
+    "FTS_TABLE_EXISTS": "sqlite_master ist klein",
+}
+
+# Vorlagen mit {platzhaltern}: Varianten, die CustomerManager tatsächlich erzeugt
+_SORT_VARIANTS = [(name, order) for name in sql.SORT_KEYS for order in ("ASC", "DESC")]
+
+
+def _template_variants():
+    for name, order in _SORT_VARIANTS:
+        key = sql.SORT_KEYS[name]
+        op = ">" if order == "ASC" else "<"
+        yield (f"SELECT_CUSTOMERS_PAGE[{name} {order}]",
+               sql.SELECT_CUSTOMERS_PAGE.format(where="", key=key, order=order))
+        yield (f"SELECT_CUSTOMERS_PAGE[{name} {order} keyset]",
+               sql.SELECT_CUSTOMERS_PAGE.format(where=sql.KEYSET_WHERE.format(key=key, op=op), key=key, order=order))
+        yield (f"SELECT_ALL_CUSTOMERS_ORDERED[{name} {order}]",
+               sql.SELECT_ALL_CUSTOMERS_ORDERED.format(key=key, order=order))
+        yield (f"SEARCH_CUSTOMERS_ORDERED[{name} {order}]",
+               sql.SEARCH_CUSTOMERS_ORDERED.format(key=key, order=order))
+        yield (f"SEARCH_CUSTOMERS_LIKE[{name} {order}]",
+               sql.SEARCH_CUSTOMERS_LIKE.format(order_by=f"ORDER BY {key} {order}, id {order}"))
+        yield (f"SEARCH_CUSTOMERS_PHONE[{name} {order}]",
+               sql.SEARCH_CUSTOMERS_PHONE.format(order_by=f"ORDER BY {key} {order}, id {order}"))
+    yield "SEARCH_CUSTOMERS_LIKE[relevanz]", sql.SEARCH_CUSTOMERS_LIKE.format(order_by="")
+    yield "SEARCH_CUSTOMERS_PHONE[relevanz]", sql.SEARCH_CUSTOMERS_PHONE.format(order_by="ORDER BY phone_digits, id")
+    yield "SELECT_CUSTOMERS_BY_IDS[3]", sql.SELECT_CUSTOMERS_BY_IDS.format(placeholders="?, ?, ?")
+
+
+_TEMPLATES = {"SELECT_CUSTOMERS_PAGE", "SELECT_ALL_CUSTOMERS_ORDERED", "SEARCH_CUSTOMERS_ORDERED",
+              "SEARCH_CUSTOMERS_LIKE", "SEARCH_CUSTOMERS_PHONE", "SELECT_CUSTOMERS_BY_IDS"}
+_DML = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.I)
+
+
+def registered_statements():
+    # Alle Anweisungen aus sql_commands: feste direkt, Vorlagen über ihre Varianten.
+    # Neue Konstanten werden automatisch mitgeprüft; neue Vorlagen landen als "nicht geprüft" im Bericht.
+    for name in dir(sql):
+        if not name.isupper() or name in _TEMPLATES:
+            continue
+        value = getattr(sql, name)
+        statements = value if isinstance(value, list) else [value]
+        for i, stmt in enumerate(statements):
+            if not isinstance(stmt, str) or not _DML.match(stmt):
+                continue
+            label = name if len(statements) == 1 else f"{name}[{i}]"
+            yield label, stmt
+    yield from _template_variants()
+
+
+def _params(stmt):
+    # Beispielwerte für alle Parameter; der Plan hängt nicht von den Werten ab
+    positional = stmt.count("?")
+    if positional:
+        return tuple(range(1, positional + 1))
+    params = {}
+    for name in re.findall(r":(\w+)", stmt):
+        if name == "query":
+            params[name] = '"muster"*' if "MATCH" in stmt else "%muster%"
+        elif name in ("id", "limit", "after", "until"):
+            params[name] = 200
+        elif name == "start":
+            params[name] = "2024-01-01"
+        elif name == "end":
+            params[name] = "2024-12-31"
+        else:
+            params[name] = ""
+    return params
+
+
+def _issues(plan, stmt):
+    issues = []
+    limited = re.search(r"\bLIMIT\b", stmt, re.I) is not None
+    sorts = any(detail.startswith("USE TEMP B-TREE") for detail in plan)
+    for detail in plan:
+        if detail.startswith("USE TEMP B-TREE"):
+            issues.append(detail)
+        elif detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail:
+            # Geordneter Scan mit LIMIT (Keyset-Paging) liest nur eine Seite
+            if not (limited and not sorts):
+                issues.append(detail)
+    return issues
+
+
+def _scanned_tables(issues):
+    return {m.group(1) for m in (re.match(r"SCAN (\w+)", i) for i in issues) if m}
+
+
+def audit(conn, log=print, time_queries=True):
+    # Ergebnis je Anweisung: name, sql, plan, issues, expected (Begründung oder None), table_rows, ms
+    row_counts = {}
+    results = []
+    for name, stmt in registered_statements():
+        params = _params(stmt)
+        result = {"name": name, "sql": " ".join(stmt.split()), "plan": [], "issues": [],
+                  "expected": EXPECTED.get(name.split("[")[0]), "table_rows": 0, "ms": None}
+        try:
+            result["plan"] = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + stmt, params)]
+        except sqlite3.Error as e:
+            # z.B. SQLite ohne FTS5: customers_fts fehlt
+            result["issues"] = [f"Fehler: {e}"]
+            result["expected"] = result["expected"] or "Anweisung im aktuellen Schema nicht ausführbar"
+            results.append(result)
+            continue
+        result["issues"] = _issues(result["plan"], stmt)
+        for table in _scanned_tables(result["issues"]):
+            if table not in row_counts:
+                try:
+                    row_counts[table] = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                except sqlite3.Error:
+                    row_counts[table] = 0
+            result["table_rows"] = max(result["table_rows"], row_counts[table])
+        if result["issues"] and time_queries and stmt.lstrip().upper().startswith("SELECT"):
+            # Nur lesende Anweisungen werden zur Zeitmessung wirklich ausgeführt
+            start = time.perf_counter()
+            conn.execute(stmt, params).fetchall()
+            result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if result["issues"] and log:
+            state = f"bekannt ({result['expected']})" if result["expected"] else "UNERWARTET"
+            timing = f", {result['ms']} ms" if result["ms"] is not None else ""
+            log(f"[SQL-Plan] {state}: {name} – {'; '.join(result['issues'])} "
+                f"({result['table_rows']} Zeilen{timing})\n    {result['sql']}")
+        results.append(result)
+    return results
+
+
+def unexpected(results, min_rows=0):
+    return [r for r in results if r["issues"] and not r["expected"] and r["table_rows"] >= min_rows]
+
+
+def audit_database(db_path, log=print, time_queries=True):
+    # Eigene read-only Verbindung: das Audit kann nichts verändern und läuft neben der App
+    conn = sqlite3.connect(pathlib.Path(db_path).absolute().as_uri() + "?mode=ro", uri=True)
+    try:
+        return audit(conn, log, time_queries)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    from Utils.config import Config
+    path = sys.argv[1] if len(sys.argv) > 1 else Config().get("db_path", "data/customers.db")
+    found = audit_database(path)
+    bad = unexpected(found)
+    print(f"{len(found)} Anweisungen geprüft, {sum(1 for r in found if r['issues'])} auffällig, {len(bad)} unerwartet")
+    sys.exit(1 if bad else 0)
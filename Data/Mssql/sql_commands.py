@@ -15,32 +15,279 @@ CREATE TABLE IF NOT EXISTS customers (
 )
 """
 
+# Feste Spaltenreihenfolge = Reihenfolge der Customer-Parameter (Row-Factory baut Customer(*row))
+CUSTOMER_COLUMNS = """id, date, lastName, firstName, birthDate, address, telephoneNumber,
+       email, insurance, doctor, pretreatment, reason"""
+
 INSERT_CUSTOMER = """
 INSERT INTO customers (date, lastName, firstName, birthDate, address,
-                       telephoneNumber, email, insurance, doctor, pretreatment, reason)
+                       telephoneNumber, email, insurance, doctor, pretreatment, reason,
+                       lastName_phon, firstName_phon)
 VALUES (:date, :lastName, :firstName, :birthDate, :address,
-        :telephoneNumber, :email, :insurance, :doctor, :pretreatment, :reason)
+        :telephoneNumber, :email, :insurance, :doctor, :pretreatment, :reason,
+        :lastName_phon, :firstName_phon)
 """
 
 UPDATE_CUSTOMER = """
 UPDATE customers
 SET date=:date, lastName=:lastName, firstName=:firstName, birthDate=:birthDate,
     address=:address, telephoneNumber=:telephoneNumber, email=:email,
-    insurance=:insurance, doctor=:doctor, pretreatment=:pretreatment, reason=:reason
+    insurance=:insurance, doctor=:doctor, pretreatment=:pretreatment, reason=:reason,
+    lastName_phon=:lastName_phon, firstName_phon=:firstName_phon
 WHERE id=:id
 """
 
 DELETE_CUSTOMER = "DELETE FROM customers WHERE id=:id"
 
-SELECT_ALL_CUSTOMERS = "SELECT * FROM customers"
+DELETE_CUSTOMERS_IN_RANGE = "DELETE FROM customers WHERE date >= :start AND date <= :end"
+
+COUNT_CUSTOMERS_IN_RANGE = "SELECT COUNT(*) FROM customers WHERE date >= :start AND date <= :end"
+
+SELECT_ALL_CUSTOMERS = f"SELECT {CUSTOMER_COLUMNS} FROM customers"
+
+COUNT_CUSTOMERS = "SELECT COUNT(*) FROM customers"
+
+# Erlaubte Sortierspalten (Whitelist) -> Sortierausdruck
+SORT_KEYS = {
+    "id": "id",
+    "date": "IFNULL(date, '') COLLATE NOCASE",
+    "lastName": "IFNULL(lastName, '') COLLATE NOCASE",
+    "firstName": "IFNULL(firstName, '') COLLATE NOCASE",
+    "birthDate": "IFNULL(birthDate, '') COLLATE NOCASE",
+    "address": "IFNULL(address, '') COLLATE NOCASE",
+    "telephoneNumber": "IFNULL(telephoneNumber, '') COLLATE NOCASE",
+    "email": "IFNULL(email, '') COLLATE NOCASE",
+    "insurance": "IFNULL(insurance, '') COLLATE NOCASE",
+    "doctor": "IFNULL(doctor, '') COLLATE NOCASE",
+    "pretreatment": "IFNULL(pretreatment, '') COLLATE NOCASE",
+    "reason": "IFNULL(reason, '') COLLATE NOCASE",
+}
+
+# Je Sortierspalte ein Index auf (Ausdruck, id), passend zu SORT_KEYS
+CREATE_SORT_INDEX = "CREATE INDEX IF NOT EXISTS idx_customers_sort_{name} ON customers({key}, id)"
+
+# Keyset-Paging: {where} ist leer oder KEYSET_WHERE
+SELECT_CUSTOMERS_PAGE = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+{{where}}
+ORDER BY {{key}} {{order}}, id {{order}}
+LIMIT :limit
+"""
+
+# Ausgeschrieben statt Row-Value "(key, id) > (...)", sonst nutzt SQLite den Index nur zum Scannen
+KEYSET_WHERE = "WHERE {key} {op}= :key AND ({key} {op} :key OR id {op} :id)"
+
+SELECT_ALL_CUSTOMERS_ORDERED = f"SELECT {CUSTOMER_COLUMNS} FROM customers ORDER BY {{key}} {{order}}, id {{order}}"
+
+# Datumswerte mit Punkt (TT.MM.JJJJ, auch 1.2.2024) blockweise über id-Bereiche; umgerechnet wird
+# in Python mit to_iso_date, damit Migration und Speichern dieselben Regeln haben
+SELECT_DATES_TO_NORMALIZE = """
+SELECT id, date, birthDate FROM customers
+WHERE id > :after AND id <= :until AND (date LIKE '%.%' OR birthDate LIKE '%.%')
+"""
+
+SET_DATES = "UPDATE customers SET date=:date, birthDate=:birthDate WHERE id=:id"
+
+MAX_CUSTOMER_ID = "SELECT IFNULL(MAX(id), 0) FROM customers"
+
+CREATE_BASE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(lastName, firstName)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_date ON customers(date)",
+]
+
+# Normalisierte Suchspalten als VIRTUAL generated columns (SQLite >= 3.31): kein Speicher, keine Trigger,
+# nur die Indizes. Die Ausdrücke sind reines SQL, damit auch andere Programme die Datenbank beschreiben können;
+# fold_name()/phone_digits() in customer_manager müssen exakt dasselbe rechnen.
+# Namen: lower() faltet nur A-Z, Umlaute und ß werden von Hand ergänzt
+_FOLD = ("replace(lower(replace(replace(replace(replace(IFNULL({col}, ''), 'ẞ', 'ss'), "
+         "'Ä', 'ä'), 'Ö', 'ö'), 'Ü', 'ü')), 'ß', 'ss')")
+# Telefon: +49/0049 -> 0, dann Trennzeichen entfernen
+_PHONE_NATIONAL = ("CASE WHEN substr(ltrim(IFNULL(telephoneNumber, '')), 1, 3) = '+49' "
+                   "THEN '0' || substr(ltrim(telephoneNumber), 4) "
+                   "WHEN substr(ltrim(IFNULL(telephoneNumber, '')), 1, 4) = '0049' "
+                   "THEN '0' || substr(ltrim(telephoneNumber), 5) "
+                   "ELSE IFNULL(telephoneNumber, '') END")
+PHONE_SEPARATORS = (" ", "/", "-", "(", ")", ".", "+")
+_PHONE = _PHONE_NATIONAL
+for _sep in PHONE_SEPARATORS:
+    _PHONE = f"replace({_PHONE}, '{_sep}', '')"
+
+NORMALIZED_COLUMNS = {
+    "lastName_fold": _FOLD.format(col="lastName"),
+    "firstName_fold": _FOLD.format(col="firstName"),
+    "phone_digits": _PHONE,
+}
+
+ADD_GENERATED_COLUMN = "ALTER TABLE customers ADD COLUMN {name} TEXT GENERATED ALWAYS AS ({expr}) VIRTUAL"
+
+TABLE_COLUMNS = "SELECT name FROM pragma_table_xinfo('customers')"
+
+CREATE_NORMALIZED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_customers_name_fold ON customers(lastName_fold, firstName_fold)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_first_fold ON customers(firstName_fold)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_phone_digits ON customers(phone_digits)",
+]
+
+# Präfix-Suche als Bereich (>= p AND < p + U+10FFFF), das nutzt den Index auch ohne LIKE-Optimierung
+FIND_CUSTOMERS_BY_NAME = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE lastName_fold >= :last AND lastName_fold < :last_end
+  AND firstName_fold >= :first AND firstName_fold < :first_end
+ORDER BY lastName_fold, firstName_fold, id
+LIMIT :limit
+"""
+
+# {order_by} wie bei SEARCH_CUSTOMERS_LIKE
+SEARCH_CUSTOMERS_PHONE = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE phone_digits >= :digits AND phone_digits < :digits_end
+{{order_by}}
+"""
+
+COUNT_SEARCH_CUSTOMERS_PHONE = "SELECT COUNT(*) FROM customers WHERE phone_digits >= :digits AND phone_digits < :digits_end"
+
+# Phonetische Schlüssel (Kölner Phonetik) sind echte Spalten: SQLite kennt die Funktion nicht,
+# CustomerManager berechnet sie beim Schreiben (Utils/phonetik.py), Migration 5 füllt Altbestände nach
+PHONETIC_COLUMNS = ("lastName_phon", "firstName_phon")
+
+ADD_COLUMN = "ALTER TABLE customers ADD COLUMN {name} TEXT"
+
+SELECT_NAMES_WITHOUT_PHONETIC = """
+SELECT id, lastName, firstName FROM customers
+WHERE id > :after AND id <= :until AND lastName_phon IS NULL
+"""
+
+SET_PHONETIC_KEYS = "UPDATE customers SET lastName_phon=:lastName_phon, firstName_phon=:firstName_phon WHERE id=:id"
+
+# Gefaltete Namen hinter dem Schlüssel: verschiedene Schreibweisen lassen sich direkt im Index abzählen
+CREATE_PHONETIC_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_customers_phon "
+    "ON customers(lastName_phon, lastName_fold, firstName_fold, firstName_phon)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_first_phon "
+    "ON customers(firstName_phon, firstName_fold, lastName_fold, lastName_phon)",
+]
+
+# Nächste Schreibweise zu einem Schlüssel (je Aufruf ein Indexsprung statt alle Meyers zu lesen)
+NEXT_LAST_SPELLING = """
+SELECT lastName_fold FROM customers
+WHERE lastName_phon = :key AND lastName_fold > :after
+ORDER BY lastName_fold LIMIT 1
+"""
+
+NEXT_FIRST_SPELLING = """
+SELECT firstName_fold FROM customers
+WHERE firstName_phon = :key AND firstName_fold > :after
+ORDER BY firstName_fold LIMIT 1
+"""
 
-SELECT_CUSTOMER_BY_ID = "SELECT * FROM customers WHERE id=:id"
+SEARCH_PHONETIC_LAST = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE lastName_phon = :key AND lastName_fold = :last
+ORDER BY firstName_fold, firstName_phon, id
+LIMIT :limit
+"""
 
-SEARCH_CUSTOMERS = """
-SELECT * FROM customers
+SEARCH_PHONETIC_FIRST = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE firstName_phon = :key AND firstName_fold = :first
+ORDER BY lastName_fold, lastName_phon, id
+LIMIT :limit
+"""
+
+SEARCH_PHONETIC_FULL = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE lastName_phon = :last_key AND lastName_fold = :last
+  AND firstName_fold = :first AND firstName_phon = :first_key
+ORDER BY id
+LIMIT :limit
+"""
+
+SELECT_CUSTOMER_BY_ID = f"SELECT {CUSTOMER_COLUMNS} FROM customers WHERE id=:id"
+
+# {placeholders}: "?, ?, ..." - höchstens MAX_SQL_VARIABLES pro Abfrage
+SELECT_CUSTOMERS_BY_IDS = f"SELECT {CUSTOMER_COLUMNS} FROM customers WHERE id IN ({{placeholders}})"
+
+# Älteste SQLite-Versionen erlauben nur 999 gebundene Parameter
+MAX_SQL_VARIABLES = 900
+
+# Volltextindex (FTS5) über die Suchspalten, wird per Trigger synchron gehalten
+CREATE_CUSTOMER_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+    lastName, firstName, email, telephoneNumber, address, doctor, insurance,
+    content='customers',
+    content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+)
+"""
+
+CREATE_CUSTOMER_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+        INSERT INTO customers_fts(rowid, lastName, firstName, email, telephoneNumber,
+                                  address, doctor, insurance)
+        VALUES (new.id, new.lastName, new.firstName, new.email, new.telephoneNumber,
+                new.address, new.doctor, new.insurance);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, lastName, firstName, email,
+                                  telephoneNumber, address, doctor, insurance)
+        VALUES ('delete', old.id, old.lastName, old.firstName, old.email,
+                old.telephoneNumber, old.address, old.doctor, old.insurance);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_au
+    AFTER UPDATE OF lastName, firstName, email, telephoneNumber, address, doctor, insurance ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, lastName, firstName, email,
+                                  telephoneNumber, address, doctor, insurance)
+        VALUES ('delete', old.id, old.lastName, old.firstName, old.email,
+                old.telephoneNumber, old.address, old.doctor, old.insurance);
+        INSERT INTO customers_fts(rowid, lastName, firstName, email, telephoneNumber,
+                                  address, doctor, insurance)
+        VALUES (new.id, new.lastName, new.firstName, new.email, new.telephoneNumber,
+                new.address, new.doctor, new.insurance);
+    END
+    """,
+]
+
+# Ältere Datenbanken haben den Trigger ohne Spaltenliste (feuert auch bei Datums-/Schlüssel-Updates)
+DROP_FTS_UPDATE_TRIGGER = "DROP TRIGGER IF EXISTS customers_fts_au"
+
+FTS_TABLE_EXISTS = "SELECT 1 FROM sqlite_master WHERE type='table' AND name='customers_fts'"
+
+REBUILD_CUSTOMER_FTS = "INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')"
+
+SEARCH_CUSTOMERS = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+JOIN (SELECT rowid AS fts_id, rank AS fts_rank FROM customers_fts WHERE customers_fts MATCH :query) AS hits
+  ON hits.fts_id = customers.id
+ORDER BY hits.fts_rank
+"""
+
+SEARCH_CUSTOMERS_ORDERED = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+WHERE id IN (SELECT rowid FROM customers_fts WHERE customers_fts MATCH :query)
+ORDER BY {{key}} {{order}}, id {{order}}
+"""
+
+COUNT_SEARCH_CUSTOMERS = "SELECT COUNT(*) FROM customers_fts WHERE customers_fts MATCH :query"
+
+# Fallback, falls SQLite ohne FTS5 gebaut wurde ({order_by} ist leer oder "ORDER BY ...")
+SEARCH_LIKE_WHERE = """
 WHERE LOWER(firstName) LIKE :query
    OR LOWER(lastName)  LIKE :query
    OR LOWER(email)     LIKE :query
    OR LOWER(telephoneNumber) LIKE :query
 """
+
+SEARCH_CUSTOMERS_LIKE = f"""
+SELECT {CUSTOMER_COLUMNS} FROM customers
+{SEARCH_LIKE_WHERE}
+{{order_by}}
+"""
+
+COUNT_SEARCH_CUSTOMERS_LIKE = f"SELECT COUNT(*) FROM customers {SEARCH_LIKE_WHERE}"
 DELETE_ALL_CUSTOMERS = "DELETE FROM customers;"
\ No newline at end of file
@@ -1,4 +1,8 @@
 class Customer:
+    # __slots__ statt __dict__: deutlich weniger Speicher pro Kunde bei großen Listen
+    __slots__ = ("id", "date", "lastName", "firstName", "birthDate", "address",
+                 "telephoneNumber", "email", "insurance", "doctor", "pretreatment", "reason")
+
     def __init__(self, id, date="", lastName="", firstName="", birthDate="",
                  address="", telephoneNumber="", email="", insurance="",
                  doctor="", pretreatment="", reason=""):
@@ -19,4 +23,7 @@ class Customer:
         # Update customer details except ID
         for key, value in kwargs.items():
             if key != "id" and hasattr(self, key):
-                setattr(self, key, value)
\ No newline at end of file
+                setattr(self, key, value)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
@@ -9,9 +9,9 @@ from Frontend.constants import labels, label_to_attr, required_fields
 
 
 class CustomerForm(ctk.CTkToplevel):
-    def __init__(self, parent, manager, config, customer=None, on_save=None):
+    def __init__(self, parent, db, config, customer=None, on_save=None):
         super().__init__(parent)
-        self.manager = manager
+        self.db = db
         self.config = config
         self.customer = customer
         self.on_save = on_save
@@ -83,8 +83,8 @@ class CustomerForm(ctk.CTkToplevel):
 
         button_frame = ctk.CTkFrame(main_frame)
         button_frame.grid(row=len(labels), column=0, columnspan=2, pady=20)
-        btn_save = ctk.CTkButton(button_frame, text="Speichern", width=120, command=self.save_customer)
-        btn_save.pack(side="left", padx=10)
+        self.btn_save = ctk.CTkButton(button_frame, text="Speichern", width=120, command=self.save_customer)
+        self.btn_save.pack(side="left", padx=10)
         btn_cancel = ctk.CTkButton(button_frame, text="Abbrechen", width=120, command=self.destroy)
         btn_cancel.pack(side="right", padx=10)
 
@@ -154,15 +154,22 @@ class CustomerForm(ctk.CTkToplevel):
                     break
             return
 
+        # Speichern läuft auf dem DB-Thread, das Fenster schließt im Callback
+        self.btn_save.configure(state="disabled")
         if self.customer:
-            self.manager.update_customer(self.customer.id, **data)
+            self.db.submit("update_customer", self.customer.id, callback=self._on_saved, errback=self._on_save_error, **data)
         else:
-            self.manager.add_customer(**data)
+            self.db.submit("add_customer", callback=self._on_saved, errback=self._on_save_error, **data)
 
+    def _on_saved(self, customer):
         if self.on_save:
             self.on_save()
         self.destroy()
 
+    def _on_save_error(self, error):
+        self.btn_save.configure(state="normal")
+        messagebox.showerror("Fehler", f"Speichern fehlgeschlagen:\n{error}", parent=self)
+
     def _validate_live(self, label, entry, event=None):
         val = entry.get().strip()
         self._clear_invalid(entry)
@@ -0,0 +1,95 @@
+import customtkinter as ctk
+from tkinter import messagebox
+from Utils.validierung import parse_de_date
+
+class DeleteRangeWindow(ctk.CTkToplevel):
+    def __init__(self, master, db, config, on_done=None):
+        super().__init__(master)
+        self.title("Massen löschen")
+        self.geometry("400x300")
+
+        self.transient(master)
+        self.grab_set()
+        self.focus_force()
+        self.lift()
+
+        self.db = db
+        self.config = config
+        self.on_done = on_done
+        self._count = None
+
+        frame = ctk.CTkFrame(self)
+        frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        # Zeitbereich (Feld "Datum")
+        ctk.CTkLabel(frame, text="Von (TT.MM.JJJJ):").pack(anchor="w", pady=(0, 5))
+        self.entry_start = ctk.CTkEntry(frame)
+        self.entry_start.pack(fill="x", pady=(0, 10))
+        ctk.CTkLabel(frame, text="Bis (TT.MM.JJJJ):").pack(anchor="w", pady=(0, 5))
+        self.entry_end = ctk.CTkEntry(frame)
+        self.entry_end.pack(fill="x", pady=(0, 10))
+        for entry in (self.entry_start, self.entry_end):
+            entry.bind("<KeyRelease>", self._reset_preview)
+
+        self.preview_label = ctk.CTkLabel(frame, text="", text_color="#6b7280")
+        self.preview_label.pack(anchor="w", pady=(0, 10))
+
+        # Buttons
+        btn_frame = ctk.CTkFrame(frame)
+        btn_frame.pack(fill="x", pady=10)
+        ctk.CTkButton(btn_frame, text="Vorschau", command=self.preview).pack(side="left", expand=True, padx=5)
+        self.btn_delete = ctk.CTkButton(btn_frame, text="Löschen", command=self.delete, state="disabled")
+        self.btn_delete.pack(side="left", expand=True, padx=5)
+        ctk.CTkButton(btn_frame, text="Abbrechen", command=self.destroy).pack(side="left", expand=True, padx=5)
+
+    def _range(self):
+        start = parse_de_date(self.entry_start.get())
+        end = parse_de_date(self.entry_end.get())
+        if not start or not end:
+            messagebox.showwarning("Fehler", "Bitte Von und Bis als TT.MM.JJJJ angeben.", parent=self)
+            return None
+        if start > end:
+            messagebox.showwarning("Fehler", "Das Von-Datum liegt nach dem Bis-Datum.", parent=self)
+            return None
+        return start, end
+
+    def _reset_preview(self, event=None):
+        self._count = None
+        self.preview_label.configure(text="")
+        self.btn_delete.configure(state="disabled")
+
+    def preview(self):
+        rng = self._range()
+        if not rng:
+            return
+        self.db.submit("count_customers_in_range", *rng, key="delete_range_preview", callback=self._on_preview)
+
+    def _on_preview(self, count):
+        self._count = count
+        self.preview_label.configure(text=f"{count} Kunden im Zeitraum")
+        self.btn_delete.configure(state="normal" if count else "disabled")
+
+    def delete(self):
+        rng = self._range()
+        if not rng or not self._count:
+            return
+        start, end = rng
+        if not messagebox.askyesno(
+            "Löschen bestätigen",
+            f"{self._count} Kunden vom {start:%d.%m.%Y} bis {end:%d.%m.%Y} wirklich löschen?",
+            parent=self,
+        ):
+            return
+        self.btn_delete.configure(state="disabled")
+        self.db.submit("delete_customers_in_range", start, end, callback=self._on_deleted, errback=self._on_delete_error)
+
+    def _on_delete_error(self, error):
+        self.btn_delete.configure(state="normal")
+        messagebox.showerror("Fehler", f"Löschen fehlgeschlagen:\n{error}", parent=self)
+
+    def _on_deleted(self, deleted):
+        if self.on_done:
+            self.on_done()
+
+        messagebox.showinfo("Massen löschen", f"{deleted} Kunden gelöscht.")
+        self.destroy()
@@ -1,30 +1,38 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from typing import Any
 import os
-import json
-from typing import cast
-from openpyxl.worksheet.worksheet import Worksheet
-
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
+import threading
+import time
+from Manager.customer_manager import OperationCancelled
+from Utils.exporters import EXPORTERS, export_pdf
+from Utils import perf
+from Utils.pdf_worker import PdfBuildJob
 
 
 class ExportWindow(ctk.CTkToplevel):
-    def __init__(self, master, manager, config, selected_ids=None):
+    def __init__(self, master, db, config, selected_ids=None):
         super().__init__(master)
         self.title("Export")
-        self.geometry("400x280")
+        self.geometry("400x340")
 
         self.transient(master)
         self.grab_set()
         self.focus_force()
         self.lift()
 
-        self.manager = manager
+        self.db = db
         self.config = config
         self.selected_ids = selected_ids
+        self._worker = None
+        self._cancel = threading.Event()
+        self._rows_done = 0
+        self._total = 0
+        self._pages = 0
+        self._missing = []
+        self._error = None
+        self._path = None
+        self._started = 0.0
 
         frame = ctk.CTkFrame(self)
         frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -44,13 +52,24 @@ class ExportWindow(ctk.CTkToplevel):
         self.format_menu = ctk.CTkOptionMenu(frame, values=format_values, variable=self.format_var)
         self.format_menu.pack(fill="x", pady=(0, 15))
 
+        # Fortschritt
+        self.progress = ctk.CTkProgressBar(frame)
+        self.progress.set(0)
+        self.progress.pack(fill="x", pady=(0, 5))
+        self.status_label = ctk.CTkLabel(frame, text="", text_color="#6b7280")
+        self.status_label.pack(anchor="w")
+
         # Buttons
         btn_frame = ctk.CTkFrame(frame)
-        btn_frame.pack(fill="x", pady=15)
-        ctk.CTkButton(btn_frame, text="Exportieren", command=self.export).pack(side="left", expand=True, padx=10)
-        ctk.CTkButton(btn_frame, text="Abbrechen", command=self.destroy).pack(side="left", expand=True, padx=10)
+        btn_frame.pack(fill="x", pady=10)
+        self.btn_export = ctk.CTkButton(btn_frame, text="Exportieren", command=self.export)
+        self.btn_export.pack(side="left", expand=True, padx=10)
+        ctk.CTkButton(btn_frame, text="Abbrechen", command=self.cancel).pack(side="left", expand=True, padx=10)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
 
     def export(self) -> None:
+        if self._worker is not None:
+            return
         fmt_label = self.format_var.get()
         scope_label = self.scope_var.get()
 
@@ -64,11 +83,6 @@ class ExportWindow(ctk.CTkToplevel):
         scope = "selected" if scope_label.startswith("Nur") else "all"
         fmt = fmt_map[fmt_label]
 
-        if scope == "selected" and self.selected_ids:
-            data: list[Any] = [self.manager.get_customer_by_id(cid) for cid in self.selected_ids]
-        else:
-            data: list[Any] = self.manager.get_all_customers() or []
-
         filetypes = {
             "xlsx": ("Excel-Datei", "*.xlsx"),
             "csv": ("CSV-Datei", "*.csv"),
@@ -84,78 +98,112 @@ class ExportWindow(ctk.CTkToplevel):
         if not path:
             return
 
+        ids = self.selected_ids if scope == "selected" and self.selected_ids else None
+        self.btn_export.configure(state="disabled")
+        self.scope_menu.configure(state="disabled")
+        self.format_menu.configure(state="disabled")
+        self._path = path
+        self._started = time.perf_counter()
+        # Eigener Thread: liest über den Reader-Pool, der DB-Thread der Oberfläche bleibt frei
+        self._worker = threading.Thread(target=self._run_export, args=(fmt, path, ids),
+                                        name="sweetNote-export", daemon=True)
+        self._worker.start()
+        self.after(100, self._poll_export)
+
+    def _run_export(self, fmt, path, ids):
+        # Läuft im Export-Thread: keine Tk-Aufrufe hier
+        manager = self.db.manager
         try:
-            if fmt == "xlsx":
-                self.export_excel(path, data)
-            elif fmt == "csv":
-                self.export_csv(path, data)
-            elif fmt == "pdf":
-                self.export_pdf(path, data)
-            elif fmt == "docx":
-                self.export_docx(path, data)
-            elif fmt == "json":
-                self.export_json(path, data)
-            messagebox.showinfo("Export", f"Export erfolgreich:\n{path}")
+            with perf.timed(f"ui.export_{fmt}"):
+                self._export(manager, fmt, path, ids)
+        except BaseException as e:
+            self._error = e
+            # Halbfertige Datei nicht liegen lassen
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _export(self, manager, fmt, path, ids):
+        # Ein Datenstand für Anzahl und alle Blöcke, auch wenn parallel gespeichert wird
+        with manager.snapshot():
+            if ids:
+                customers, self._missing = manager.get_customers_by_ids(ids)
+                self._total = len(customers)
+            else:
+                self._total = manager.count_customers()
+                customers = manager.iter_customers()
+            if fmt == "pdf":
+                customers = list(self._track(customers))
+            else:
+                EXPORTERS[fmt](path, self._track(customers))
+        if fmt == "pdf":
+            # Die Daten sind gelesen; der PDF-Prozess braucht keinen offenen Lesestand
+            self._export_pdf(path, customers)
+
+    def _export_pdf(self, path, customers):
+        # reportlab braucht die CPU: eigener Prozess, dieser Thread wartet nur und gibt die Seitenzahl weiter
+        job = PdfBuildJob(export_pdf, path, customers)
+        job.start()
+        while not job.poll():
+            if self._cancel.is_set():
+                job.cancel()
+                raise OperationCancelled()
+            self._pages = job.pages
+            time.sleep(0.1)
+        self._pages = job.pages
+        if job.error is not None:
+            raise RuntimeError(job.error)
+
+    def _track(self, customers):
+        count = 0
+        for customer in customers:
+            yield customer
+            count += 1
+            if count % 500 == 0:
+                self._rows_done = count
+                if self._cancel.is_set():
+                    raise OperationCancelled()
+        self._rows_done = count
+
+    def _poll_export(self):
+        self.progress.set(min(self._rows_done / max(self._total, 1), 1.0))
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        if self._pages:
+            self.status_label.configure(text=f"{self._rows_done} Kunden · PDF Seite {self._pages}")
+        else:
+            self.status_label.configure(text=f"{self._rows_done} / {self._total} Kunden · {self._rows_done / elapsed:.0f} Kunden/s")
+
+        if self._worker.is_alive():
+            self.after(100, self._poll_export)
+            return
+
+        self._worker = None
+        if isinstance(self._error, OperationCancelled):
+            messagebox.showinfo("Export", "Export abgebrochen.")
             self.destroy()
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Export fehlgeschlagen:\n{e}")
+            return
+        if self._error is not None:
+            messagebox.showerror("Fehler", f"Export fehlgeschlagen:\n{self._error}")
+            self._error = None
+            self._rows_done = 0
+            self._pages = 0
+            self.progress.set(0)
+            self.btn_export.configure(state="normal")
+            self.scope_menu.configure(state="normal")
+            self.format_menu.configure(state="normal")
+            return
 
-    def export_excel(self, path: str, data: list[Any]) -> None:
-        from openpyxl import Workbook
-        wb = Workbook()
-        ws = cast(Worksheet, wb.active)
+        info = f"Export erfolgreich:\n{self._path}"
+        if self._missing:
+            info += f"\n\n{len(self._missing)} ausgewählte Kunden existieren nicht mehr: {', '.join(map(str, self._missing[:20]))}"
+        messagebox.showinfo("Export", info)
+        self.destroy()
 
-        if not data:
-            ws.append(["Keine Daten"])
-        else:
-            ws.append(list(data[0].__dict__.keys()))
-            for c in data:
-                ws.append([getattr(c, k) for k in c.__dict__.keys()])
-        wb.save(path)
-
-    def export_csv(self, path: str, data: list[Any]) -> None:
-        import csv
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if not data:
-                writer.writerow(["Keine Daten"])
-            else:
-                writer.writerow(list(data[0].__dict__.keys()))
-                for c in data:
-                    writer.writerow([getattr(c, k) for k in c.__dict__.keys()])
-
-    def export_pdf(self, path: str, data: list[Any]) -> None:
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-        doc = SimpleDocTemplate(path, pagesize=A4)
-        if not data:
-            table_data = [["Keine Daten"]]
-        else:
-            table_data = [list(data[0].__dict__.keys())]
-            for c in data:
-                table_data.append([str(getattr(c, k)) for k in c.__dict__.keys()])
-        table = Table(table_data)
-        table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
-        doc.build([table])
-
-    def export_docx(self, path: str, data: list[Any]) -> None:
-        from docx import Document
-        doc = Document()
-        if not data:
-            doc.add_paragraph("Keine Daten")
-        else:
-            table = doc.add_table(rows=1, cols=len(data[0].__dict__.keys()))
-            hdr_cells = table.rows[0].cells
-            for i, key in enumerate(data[0].__dict__.keys()):
-                hdr_cells[i].text = key
-            for c in data:
-                row_cells = table.add_row().cells
-                for i, key in enumerate(c.__dict__.keys()):
-                    row_cells[i].text = str(getattr(c, key))
-        doc.save(path)
-
-    def export_json(self, path: str, data: list[Any]) -> None:
-        with open(path, "w", encoding="utf-8") as f:
-            if not data:
-                json.dump({"info": "Keine Daten"}, f, ensure_ascii=False, indent=2)
-            else:
-                json.dump([c.__dict__ for c in data], f, ensure_ascii=False, indent=2)
\ No newline at end of file
+    def cancel(self):
+        if self._worker is None:
+            self.destroy()
+            return
+        # Export-Thread bricht nach dem aktuellen Block ab und löscht die Datei
+        self._cancel.set()
+        self.status_label.configure(text="Export wird abgebrochen…")
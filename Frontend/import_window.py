@@ -1,24 +1,36 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import json
 import os
+import threading
+import time
+from Manager.customer_manager import OperationCancelled
+from Utils import perf
+from Utils.json_stream import JsonArrayReader
 
 class ImportWindow(ctk.CTkToplevel):
-    def __init__(self, master, manager, config, on_done=None):
+    def __init__(self, master, db, config, on_done=None):
         super().__init__(master)
         self.title("Import (JSON)")
-        self.geometry("400x280")
+        self.geometry("400x360")
 
         self.transient(master)
         self.grab_set()
         self.focus_force()
         self.lift()
 
-        self.manager = manager
+        self.db = db
         self.config = config
         self.on_done = on_done
         self.file_path = None
+        self._worker = None
+        self._cancel = threading.Event()
+        self._reader = None
+        self._rows_done = 0
+        self._result = None
+        self._error = None
+        self._started = 0.0
+        self._total_bytes = 1
 
         frame = ctk.CTkFrame(self)
         frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -37,11 +49,20 @@ class ImportWindow(ctk.CTkToplevel):
         self.mode_menu = ctk.CTkOptionMenu(frame, values=["Anhängen", "Bestehende ersetzen"], variable=self.mode_var)
         self.mode_menu.pack(fill="x", pady=(0, 15))
 
+        # Progress
+        self.progress = ctk.CTkProgressBar(frame)
+        self.progress.set(0)
+        self.progress.pack(fill="x", pady=(0, 5))
+        self.status_label = ctk.CTkLabel(frame, text="", text_color="#6b7280")
+        self.status_label.pack(anchor="w")
+
         # Buttons
         btn_frame = ctk.CTkFrame(frame)
         btn_frame.pack(fill="x", pady=10)
-        ctk.CTkButton(btn_frame, text="Importieren", command=self.import_json).pack(side="left", expand=True, padx=10)
-        ctk.CTkButton(btn_frame, text="Abbrechen", command=self.destroy).pack(side="left", expand=True, padx=10)
+        self.btn_import = ctk.CTkButton(btn_frame, text="Importieren", command=self.import_json)
+        self.btn_import.pack(side="left", expand=True, padx=10)
+        ctk.CTkButton(btn_frame, text="Abbrechen", command=self.cancel).pack(side="left", expand=True, padx=10)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
 
     def choose_file(self):
         path = filedialog.askopenfilename(filetypes=[("JSON Dateien", "*.json")])
@@ -51,28 +72,69 @@ class ImportWindow(ctk.CTkToplevel):
             self.file_entry.insert(0, path)
 
     def import_json(self):
+        if self._worker is not None:
+            return
         if not self.file_path or not os.path.exists(self.file_path):
             messagebox.showwarning("Fehler", "Bitte eine gültige JSON-Datei auswählen.")
             return
 
-        try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                customers = json.load(f)
+        self.btn_import.configure(state="disabled")
+        self.mode_menu.configure(state="disabled")
+        self._total_bytes = max(os.path.getsize(self.file_path), 1)
+        self._started = time.perf_counter()
+        replace = self.mode_var.get() == "Bestehende ersetzen"
+        self._worker = self.db.submit(self._run_import, self.file_path, replace)
+        self.after(100, self._poll_import)
 
-            if not isinstance(customers, list):
-                raise ValueError("Ungültiges JSON-Format.")
+    def _run_import(self, manager, path, replace):
+        # Läuft auf dem DB-Thread: keine Tk-Aufrufe hier
+        try:
+            with perf.timed("ui.import_json"), open(path, "rb") as f:
+                self._reader = JsonArrayReader(f)
+                self._result = manager.bulk_insert(
+                    self._reader, replace=replace, atomic=True,
+                    progress=self._on_progress, cancel=self._cancel
+                )
+        except BaseException as e:
+            self._error = e
+
+    def _on_progress(self, count):
+        self._rows_done = count
+
+    def _poll_import(self):
+        if self._reader is not None:
+            self.progress.set(min(self._reader.bytes_read / self._total_bytes, 1.0))
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        self.status_label.configure(text=f"{self._rows_done} Kunden · {self._rows_done / elapsed:.0f} Kunden/s")
+
+        if not self._worker.done():
+            self.after(100, self._poll_import)
+            return
 
-            if self.mode_var.get() == "Bestehende ersetzen":
-                self.manager.delete_all_customers()
+        self._worker = None
+        if isinstance(self._error, OperationCancelled):
+            messagebox.showinfo("Import", "Import abgebrochen, es wurden keine Daten übernommen.")
+            self.destroy()
+            return
+        if self._error is not None:
+            messagebox.showerror("Fehler", f"Import fehlgeschlagen:\n{self._error}")
+            self._error = None
+            self._rows_done = 0
+            self.progress.set(0)
+            self.btn_import.configure(state="normal")
+            self.mode_menu.configure(state="normal")
+            return
 
-            for cust in customers:
-                self.manager.add_customer(**cust)
+        if self.on_done:
+            self.on_done()
 
-            if self.on_done:
-                self.on_done()
+        messagebox.showinfo("Import", f"{self._result} Kunden importiert.")
+        self.destroy()
 
-            messagebox.showinfo("Import", f"{len(customers)} Kunden importiert.")
+    def cancel(self):
+        if self._worker is None:
             self.destroy()
-
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Import fehlgeschlagen:\n{e}")
+            return
+        # Worker bricht nach dem aktuellen Block ab, die Transaktion wird zurückgerollt
+        self._cancel.set()
+        self.status_label.configure(text="Import wird abgebrochen…")
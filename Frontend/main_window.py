@@ -1,23 +1,46 @@
 import customtkinter as ctk
 import os
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox
 from typing import Optional
-from Utils.validierung import parse_de_date, fmt_de_date
+from Utils import perf
+from Utils.validierung import fmt_de_date
 from Frontend.customer_form import CustomerForm
 from Frontend.settings_window import SettingsWindow
 from Frontend.constants import labels, label_to_attr
 from Frontend.print_window import PrintWindow
 from Frontend.import_window import ImportWindow
 from Frontend.export_window import ExportWindow
+from Frontend.delete_range_window import DeleteRangeWindow
+from Manager.async_manager import AsyncCustomerManager
 
 class MainWindow(ctk.CTk):
     def __init__(self, manager, config):
         super().__init__()
         self.manager = manager
         self.config = config
-        self.sort_column: Optional[str] = None
+        # Alle DB-Zugriffe der Oberfläche laufen über den DB-Thread
+        self.db = AsyncCustomerManager(manager, self, on_busy=self._on_busy)
+        self.sort_column: Optional[str] = "ID"
         self.sort_reverse: bool = False
+        self.search_query: Optional[str] = None
+        # Live-Suche: erst nach einer Tipp-Pause abfragen
+        self.search_debounce_ms: int = int(config.get("search_debounce_ms", 250))
+        self._search_after = None
+        self._typed_query = ""
+        self._search_reset = False
+        self._search_timer = None
+        # Virtuelle Tabelle: nur ein Fenster aus wenigen Seiten liegt im Treeview
+        self.virtual_table: bool = bool(config.get("virtual_table", True))
+        self.page_size: int = int(config.get("table_page_size", 200))
+        self.max_pages: int = 3
+        self._paged = False
+        self._rows = []  # (Sortierschlüssel, iid) in Treeview-Reihenfolge
+        self._pages = deque()  # Zeilenzahl je geladener Seite
+        self._more_above = False
+        self._more_below = False
+        self._loading_page = False
         self.title("sweetNote - Partientenverwaltung")
 
         logo_path = os.path.join(os.path.dirname(__file__), "assets", "sweetNote_Icon128.ico")
@@ -28,15 +51,13 @@ class MainWindow(ctk.CTk):
                 print("Logo konnte nicht geladen werden:", e)
 
         self._build_ui()
+        self.db.subscribe(self._on_customer_change)
         self.update_table()
-        self.sort_column = "ID"
-        self.sort_reverse = False
-        self.sort_treeview(self.sort_column, self.sort_reverse)
-        self._update_heading_arrows()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _on_close(self):
         try:
+            self.db.close()
             self.manager.close()
         except Exception:
             pass
@@ -48,8 +69,16 @@ class MainWindow(ctk.CTk):
         self.entry_search = ctk.CTkEntry(frame_top)
         self.entry_search.pack(side="left", fill="x", expand=True, padx=(0,5))
         self.entry_search.bind("<Return>", self.btn_search_click)
+        self.entry_search.bind("<KeyRelease>", self._on_search_key)
         btn_search = ctk.CTkButton(frame_top, text="Suchen", width=100, command=self.btn_search_click)
         btn_search.pack(side="left", padx=(0,8))
+        # Phonetische Suche (Kölner Phonetik): findet Meyer bei "Maier", Schmitt bei "Schmidt"
+        self.search_phonetic = ctk.BooleanVar(value=False)
+        ctk.CTkSwitch(frame_top, text="Ähnlich klingend", variable=self.search_phonetic,
+                      command=self._on_search_mode).pack(side="left", padx=(0,8))
+        self.result_label = ctk.CTkLabel(frame_top, text="", text_color="#6b7280")
+        self.result_label.pack(side="left", padx=(0,8))
+        self.busy_indicator = ctk.CTkProgressBar(frame_top, mode="indeterminate", width=80)
         frame_table = ctk.CTkFrame(self)
         frame_table.pack(fill="both", expand=True, padx=10, pady=(0,10))
         self.columns = labels.copy()
@@ -61,7 +90,8 @@ class MainWindow(ctk.CTk):
 
         self.tree.pack(fill="both", expand=True, side="left")
         scrollbar = ttk.Scrollbar(frame_table, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = scrollbar
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True, side="left")
         self.tree.bind("<Button-1>", self.on_click)
@@ -74,6 +104,8 @@ class MainWindow(ctk.CTk):
         btn_add.pack(side="left", padx=5)
         btn_delete = ctk.CTkButton(frame_buttons, text="Löschen", width=120, command=self.btn_delete_click)
         btn_delete.pack(side="left", padx=5)
+        btn_delete_range = ctk.CTkButton(frame_buttons, text="Massen löschen", width=120, command=self.btn_delete_range_click)
+        btn_delete_range.pack(side="left", padx=5)
         btn_edit = ctk.CTkButton(frame_buttons, text="Bearbeiten", width=120, command=self.btn_edit_click)
         btn_edit.pack(side="left", padx=5)
         btn_settings = ctk.CTkButton(frame_buttons, text="⚙ Einstellungen", width=140, command=self.open_settings_window)
@@ -132,41 +164,18 @@ class MainWindow(ctk.CTk):
 
         self.tree.tag_configure("row", background=bg, foreground=fg)
 
-    def _sort_key_for_value(self, col: str, raw_value: str):
-        v = (raw_value or "").strip()
-        if v == "":
-            return (1, None)
-        if col == "ID":
-            try:
-                return (0, int(v))
-            except Exception:
-                return (0, v.lower())
-        if col in ("Datum", "Geburtstag"):
-            d = parse_de_date(v)
-            if d:
-                return (0, d.toordinal())
-            return (0, v.lower())
-        return (0, v.lower())
-
-    def sort_treeview(self, col: Optional[str], reverse: bool):
-        if col is None:
-            return
-        items = list(self.tree.get_children(""))
-        def item_key(iid):
-            cell = self.tree.set(iid, col)
-            return self._sort_key_for_value(col, cell)
-        items.sort(key=item_key, reverse=reverse)
-        for idx, iid in enumerate(items):
-            self.tree.move(iid, "", idx)
-
+    @perf.timed_function("ui.sort")
     def on_heading_click(self, col: str):
         if self.sort_column == col:
             self.sort_reverse = not self.sort_reverse
         else:
             self.sort_column = col
             self.sort_reverse = False
-        self.sort_treeview(self.sort_column, self.sort_reverse)
-        self._update_heading_arrows()
+        # Sortierung übernimmt die DB (ORDER BY), die Ansicht wird neu abgefragt
+        if self.search_query is not None:
+            self._show_search()
+        else:
+            self.update_table()
 
     def _update_heading_arrows(self):
         for c in self.columns:
@@ -176,47 +185,305 @@ class MainWindow(ctk.CTk):
                 arrow = ""
             self.tree.heading(c, text=c + arrow, command=lambda col=c: self.on_heading_click(col))
 
+    def _row_values(self, customer):
+        def fmt(col):
+            val = getattr(customer, label_to_attr[col])
+            if col in ("Geburtstag", "Datum") and isinstance(val, str):
+                return fmt_de_date(val)
+            return val
+        return [fmt(col) for col in self.columns]
+
+    def _insert_customer(self, customer, index="end"):
+        return self.tree.insert("", index, iid=str(customer.id), values=self._row_values(customer))
+
+    def _on_busy(self, busy):
+        if busy:
+            self.busy_indicator.pack(side="left", padx=(0, 8))
+            self.busy_indicator.start()
+        else:
+            self.busy_indicator.stop()
+            self.busy_indicator.pack_forget()
+
+    @perf.timed_function("ui.update_table")
     def update_table(self, customers=None):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        data = customers if customers is not None else self.manager.get_all_customers()
-        for customer in data:
-            def fmt(col):
-                val = getattr(customer, label_to_attr[col])
-                if col in ("Geburtstag", "Datum") and isinstance(val, str):
-                    return fmt_de_date(val)
-                return val
-            self.tree.insert("", "end", values=[fmt(col) for col in self.columns])
-        if self.sort_column:
-            self.sort_treeview(self.sort_column, self.sort_reverse)
+        # customers: fertig sortierte Liste (z.B. Suchergebnis), sonst alle Kunden aus der DB
+        if customers is not None:
+            self._fill_table(customers)
+            return
+        self.search_query = None
+        self.result_label.configure(text="")
+        if self.sort_column is None:
+            self.sort_column, self.sort_reverse = "ID", False
+        if self.virtual_table:
+            self._reset_table(paged=True)
+            self._load_next_page()
+        else:
+            self.db.submit("get_all_customers", self._sort_attr(), self.sort_reverse,
+                           key="table", callback=self._fill_table)
+
+    def _reset_table(self, paged):
+        self.tree.delete(*self.tree.get_children())
+        self._rows = []
+        self._pages.clear()
+        self._paged = paged
+        self._more_above = False
+        self._more_below = paged
+        self._loading_page = False
         self._update_heading_arrows()
 
+    @perf.timed_function("ui.fill_table")
+    def _fill_table(self, customers):
+        self._reset_table(paged=False)
+        for customer in customers:
+            self._insert_customer(customer)
+        self._rows = [(self._row_key(c), str(c.id)) for c in customers]
+
+    def _refresh_view(self):
+        if self.search_query is not None:
+            self._show_search()
+        else:
+            self.update_table()
+
+    # ==== virtuelle Tabelle (Keyset-Paging) ====
+    def _sort_attr(self):
+        return label_to_attr[self.sort_column] if self.sort_column else None
+
+    def _row_key(self, customer):
+        attr = self._sort_attr()
+        return self.manager.sort_key(customer, attr) if attr else None
+
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self._paged or self._loading_page:
+            return
+        if float(last) >= 0.95 and self._more_below:
+            self.after_idle(self._load_next_page)
+        elif float(first) <= 0.05 and self._more_above:
+            self.after_idle(self._load_prev_page)
+
+    def _load_next_page(self):
+        if self._loading_page or not self._more_below:
+            return
+        self._loading_page = True
+        after = self._rows[-1][0] if self._rows else None
+        # key="table": eine neue Sortierung/Suche verwirft noch laufende Seiten
+        self.db.submit("get_customers_page", self._sort_attr(), self.sort_reverse, after=after,
+                       limit=self.page_size, key="table", callback=self._on_next_page)
+
+    @perf.timed_function("ui.page")
+    def _on_next_page(self, page):
+        self._loading_page = False
+        self._more_below = len(page) == self.page_size
+        # Zeilen, die schon per Änderungs-Event eingefügt wurden, nicht doppelt anlegen
+        page = [c for c in page if not self.tree.exists(str(c.id))]
+        if not page:
+            return
+        for c in page:
+            self._insert_customer(c)
+        self._rows.extend((self._row_key(c), str(c.id)) for c in page)
+        self._pages.append(len(page))
+        if len(self._pages) > self.max_pages:
+            count = self._pages.popleft()
+            self.tree.delete(*(iid for _key, iid in self._rows[:count]))
+            del self._rows[:count]
+            self.tree.yview_scroll(-count, "units")
+            self._more_above = True
+
+    def _load_prev_page(self):
+        if self._loading_page or not self._more_above or not self._rows:
+            return
+        self._loading_page = True
+        self.db.submit("get_customers_page", self._sort_attr(), self.sort_reverse, before=self._rows[0][0],
+                       limit=self.page_size, key="table", callback=self._on_prev_page)
+
+    @perf.timed_function("ui.page")
+    def _on_prev_page(self, page):
+        self._loading_page = False
+        self._more_above = len(page) == self.page_size
+        page = [c for c in page if not self.tree.exists(str(c.id))]
+        if not page:
+            return
+        for idx, c in enumerate(page):
+            self._insert_customer(c, idx)
+        self._rows[:0] = [(self._row_key(c), str(c.id)) for c in page]
+        self._pages.appendleft(len(page))
+        self.tree.yview_scroll(len(page), "units")
+        if len(self._pages) > self.max_pages:
+            count = self._pages.pop()
+            self.tree.delete(*(iid for _key, iid in self._rows[-count:]))
+            del self._rows[-count:]
+            self._more_below = True
+
+    # ==== Änderungen einzeln einspielen statt die Tabelle neu zu laden ====
+    def _on_customer_change(self, kind, payload):
+        if kind == "reset":
+            self._refresh_view()
+        elif kind == "deleted":
+            for id in payload:
+                self._remove_row(str(id))
+        elif kind == "updated" and self._row_key(payload) is None:
+            # Suchergebnis nach Relevanz: Zeile bleibt an ihrer Stelle
+            if self.tree.exists(str(payload.id)):
+                self.tree.item(str(payload.id), values=self._row_values(payload))
+        elif kind == "updated" and self.tree.exists(str(payload.id)):
+            self._place_row(payload)
+        elif self.search_query is None:
+            # Ob ein neuer/geänderter Kunde zur Suche passt, weiß nur die DB
+            self._place_row(payload)
+
+    def _place_row(self, customer):
+        iid = str(customer.id)
+        selected = iid in self.tree.selection()
+        self._remove_row(iid)
+        key = self._row_key(customer)
+        index = self._sorted_index(key)
+        # Liegt die Zeile vor bzw. hinter dem geladenen Fenster, kommt sie beim Scrollen mit ihrer Seite
+        if (index == 0 and self._more_above) or (index == len(self._rows) and self._more_below):
+            return
+        self._insert_customer(customer, index)
+        self._rows.insert(index, (key, iid))
+        self._resize_page(index, 1)
+        if selected:
+            self.tree.selection_add(iid)
+
+    def _remove_row(self, iid):
+        if not self.tree.exists(iid):
+            return
+        index = self.tree.index(iid)
+        self.tree.delete(iid)
+        del self._rows[index]
+        self._resize_page(index, -1)
+
+    def _sorted_index(self, key):
+        # Binäre Suche in self._rows, absteigend bei sort_reverse
+        rows, reverse = self._rows, self.sort_reverse
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (rows[mid][0] > key) if reverse else (rows[mid][0] < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _resize_page(self, index, delta):
+        if not self._paged:
+            return
+        if not self._pages:
+            self._pages.append(0)
+        for i, size in enumerate(self._pages):
+            if index < size or i == len(self._pages) - 1:
+                self._pages[i] += delta
+                if self._pages[i] <= 0 and len(self._pages) > 1:
+                    del self._pages[i]
+                return
+            index -= size
+
+    def _on_search_key(self, event=None):
+        text = self.entry_search.get()
+        if text == self._typed_query:
+            return  # z.B. Pfeiltasten
+        self._typed_query = text
+        # Laufende Abfragen sind ab jetzt veraltet, der DB-Thread bricht sie nach dem aktuellen Block ab
+        self.db.cancel("search_count")
+        self.db.cancel("table")
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(self.search_debounce_ms, self.btn_search_click)
+
     def btn_search_click(self, event=None):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
         query = self.entry_search.get()
-        results = self.manager.search_customers(query)
-        self.update_table(results)
+        self._typed_query = query
+        if not query.strip():
+            self.update_table()
+            return
+        # Neue Suche: zuerst nach Relevanz, ein Klick auf den Header sortiert um
+        self.search_query = query
+        self.sort_column = None
+        self._show_search()
+
+    def _on_search_mode(self):
+        if self.search_query is not None:
+            self._show_search()
+
+    def _show_search(self):
+        # Erst die Trefferzahl, dann die Treffer blockweise; die alte Liste bleibt bis zum ersten Block stehen
+        self._search_reset = True
+        # Gemessen bis zum letzten Block; eine überholte Suche wird nie gestoppt
+        self._search_timer = perf.start("ui.search")
+        self._update_heading_arrows()
+        self.result_label.configure(text="Suche…")
+        if self.search_phonetic.get():
+            # Ähnliche Namen kommen auf einmal, die besten page_size nach Editierdistanz
+            self.db.cancel("search_count")
+            self.db.submit("search_customers_phonetic", self.search_query, self._sort_attr(), self.sort_reverse,
+                           limit=self.page_size, key="table", callback=self._on_phonetic_results)
+            return
+        self.db.submit("count_search_results", self.search_query, key="search_count",
+                       callback=lambda count: self.result_label.configure(text=f"{count} Treffer"))
+        self.db.stream("iter_search_customers", self.search_query, self._sort_attr(), self.sort_reverse,
+                       chunk_size=self.page_size, key="table",
+                       on_chunk=self._append_search_rows, callback=self._on_search_done)
+
+    @perf.timed_function("ui.search_rows")
+    def _append_search_rows(self, customers):
+        if self._search_reset:
+            self._search_reset = False
+            self._reset_table(paged=False)
+            # Weitere Blöcke folgen: Änderungs-Events nicht hinter dem geladenen Teil einfügen
+            self._more_below = True
+        customers = [c for c in customers if not self.tree.exists(str(c.id))]
+        for customer in customers:
+            self._insert_customer(customer)
+        self._rows.extend((self._row_key(c), str(c.id)) for c in customers)
+
+    def _on_phonetic_results(self, customers):
+        self.result_label.configure(text=f"{len(customers)} ähnliche Treffer")
+        if customers:
+            self._append_search_rows(customers)
+        self._on_search_done(len(customers))
+
+    def _on_search_done(self, _count):
+        if self._search_reset:
+            self._search_reset = False
+            self._reset_table(paged=False)
+        self._more_below = False
+        perf.stop(self._search_timer)
+        self._search_timer = None
 
     def btn_delete_click(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        selected_items = self.tree.selection()
+        if not selected_items:
             return
-        kunde_id = int(self.tree.item(selected_item[0])["values"][0])
-        if not messagebox.askyesno("Löschen bestätigen", f"Kunde #{kunde_id} wirklich löschen?"):
+        ids = [int(self.tree.item(i)["values"][0]) for i in selected_items]
+        if len(ids) == 1:
+            question = f"Kunde #{ids[0]} wirklich löschen?"
+        else:
+            question = f"{len(ids)} ausgewählte Kunden wirklich löschen?"
+        if not messagebox.askyesno("Löschen bestätigen", question):
             return
-        self.manager.delete_customer_by_id(kunde_id)
-        self.update_table()
+        # Die Tabelle aktualisiert sich über das "deleted"-Event
+        self.db.submit("delete_many", ids)
+
+    def btn_delete_range_click(self):
+        DeleteRangeWindow(self, self.db, self.config)
 
     def btn_add_click(self):
-        CustomerForm(self, self.manager, self.config, on_save=self.update_table)
+        CustomerForm(self, self.db, self.config)
 
     def btn_edit_click(self):
         selected_item = self.tree.selection()
         if not selected_item:
             return
         kunde_id = int(self.tree.item(selected_item[0])["values"][0])
-        kunde = self.manager.get_customer_by_id(kunde_id)
+        self.db.submit("get_customer_by_id", kunde_id, callback=self._open_edit_form)
+
+    def _open_edit_form(self, kunde):
         if kunde:
-            CustomerForm(self, self.manager, self.config, customer=kunde, on_save=self.update_table)
+            CustomerForm(self, self.db, self.config, customer=kunde)
 
     def open_settings_window(self):
         SettingsWindow(self, self.manager, self.config, on_apply=self.update_table)
@@ -224,9 +491,20 @@ class MainWindow(ctk.CTk):
     def btn_print_click(self):
         selected_items = self.tree.selection()
         if selected_items:
-            rows = [self.tree.item(i, "values") for i in selected_items]
+            ids = [int(self.tree.item(i)["values"][0]) for i in selected_items]
+            self.db.submit("get_customers_by_ids", ids, callback=lambda res: self._open_print_window(res[0]))
+        elif self._paged:
+            # Im Treeview liegt nur ein Ausschnitt -> komplette Liste aus der DB
+            self.db.submit("get_all_customers", self._sort_attr(), self.sort_reverse, callback=self._open_print_window)
         else:
+            self._open_print_window(None)
+
+    @perf.timed_function("ui.open_print_window")
+    def _open_print_window(self, customers):
+        if customers is None:
             rows = [self.tree.item(i, "values") for i in self.tree.get_children()]
+        else:
+            rows = [self._row_values(c) for c in customers]
         if not rows:
             messagebox.showwarning("Hinweis", "Keine Daten zum Drucken gefunden.")
             return
@@ -238,10 +516,10 @@ class MainWindow(ctk.CTk):
             selected_ids = [int(self.tree.item(i)["values"][0]) for i in selected_items]
         else:
             selected_ids = None
-        ExportWindow(self, self.manager, self.config, selected_ids)
+        ExportWindow(self, self.db, self.config, selected_ids)
 
     def btn_import_click(self):
-        ImportWindow(self, self.manager, self.config, on_done=self.update_table)
+        ImportWindow(self, self.db, self.config)
 
     def on_click(self, event):
         region = self.tree.identify("region", event.x, event.y)
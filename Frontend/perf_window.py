@@ -0,0 +1,79 @@
+import customtkinter as ctk
+from tkinter import ttk, filedialog, messagebox
+from Utils import perf
+
+COLUMNS = (("operation", "Operation", 380), ("count", "Anzahl", 70), ("p50_ms", "p50 ms", 80),
+           ("p95_ms", "p95 ms", 80), ("max_ms", "Max ms", 80), ("total_ms", "Summe ms", 90))
+REFRESH_MS = 1000
+
+
+class PerformanceWindow(ctk.CTkToplevel):
+    def __init__(self, parent, config):
+        super().__init__(parent)
+        self.config_obj = config
+        self.title("Performance")
+        self.geometry("860x480")
+        self.attributes("-topmost", True)
+        self.focus_force()
+
+        wrapper = ctk.CTkFrame(self, corner_radius=10)
+        wrapper.pack(fill="both", expand=True, padx=16, pady=16)
+
+        if perf.is_enabled():
+            text = f"Laufzeiten seit Start, p50/p95 über die letzten {self.config_obj.get('perf_window', perf.WINDOW)} Aufrufe"
+        else:
+            text = "Messung ist aus – in den Einstellungen einschalten und sweetNote neu starten."
+        ctk.CTkLabel(wrapper, text=text, text_color="#6b7280").pack(anchor="w", padx=6, pady=(6, 8))
+
+        table_frame = ctk.CTkFrame(wrapper)
+        table_frame.pack(fill="both", expand=True, padx=6)
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in COLUMNS], show="headings")
+        for key, title, width in COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="w" if key == "operation" else "e", stretch=key == "operation")
+        scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        btns = ctk.CTkFrame(wrapper)
+        btns.pack(fill="x", padx=6, pady=(10, 0))
+        ctk.CTkButton(btns, text="Zurücksetzen", width=110, command=self.reset).pack(side="left", padx=6)
+        ctk.CTkButton(btns, text="Exportieren…", width=110, command=self.export).pack(side="left", padx=6)
+        ctk.CTkButton(btns, text="Schließen", width=110, command=self.destroy).pack(side="right", padx=6)
+
+        self._after_id = None
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in perf.snapshot():
+            self.tree.insert("", "end", values=[row[key] for key, _title, _width in COLUMNS])
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+
+    def reset(self):
+        perf.reset()
+        self.after_cancel(self._after_id)
+        self.refresh()
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            filetypes=[("JSON-Datei", "*.json"), ("CSV-Datei", "*.csv")],
+            initialfile="sweetNote-performance.json",
+        )
+        if not path:
+            return
+        try:
+            perf.export(path)
+        except Exception as e:
+            messagebox.showerror("Fehler", f"Export fehlgeschlagen:\n{e}", parent=self)
+            return
+        messagebox.showinfo("Export", f"Messwerte gespeichert:\n{path}", parent=self)
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
@@ -1,20 +1,82 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfgen import canvas as rl_canvas
 import fitz  # PyMuPDF
 from PIL import Image, ImageTk
-import tempfile, os, datetime
+import tempfile, os, atexit, datetime, hashlib
+from collections import OrderedDict
+from Utils import perf
+from Utils.pdf_render import render_table_pdf
+from Utils.pdf_worker import PdfBuildJob
 
 try:
     import win32print
 except ImportError:
     win32print = None
 
+# Vorschau: gerendert werden nur Seiten im sichtbaren Bereich (plus eine Seite davor/danach)
+PREVIEW_ZOOMS = {"50 %": 0.5, "75 %": 0.75, "100 %": 1.0, "125 %": 1.25, "150 %": 1.5, "200 %": 2.0}
+PREVIEW_GAP = 20
+PREVIEW_PLACEHOLDER_SCALE = 0.2
+PREVIEW_CACHE_PAGES = 12
+
+# Fertige PDFs (Bytes) nach Hash von Spalten und Zeilen; erneutes Öffnen mit gleichen Daten rendert nicht neu
+PDF_CACHE_SIZE = 4
+_pdf_cache = OrderedDict()
+
+# Druckdateien: os.startfile(..., "print") kehrt zurück, bevor das Druckprogramm die Datei geöffnet hat.
+# Sie bleiben daher bis zum Programmende liegen; Reste abgestürzter Sitzungen räumt das nächste Öffnen auf.
+SPOOL_DIR = os.path.join(tempfile.gettempdir(), "sweetNote-print")
+SPOOL_MAX_AGE_S = 24 * 3600
+
+
+def _pdf_cache_key(columns, rows):
+    # Datum gehört dazu, weil es in der Fußzeile steht
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(datetime.date.today().isoformat().encode())
+    digest.update(repr(list(columns)).encode("utf-8"))
+    for row in rows:
+        digest.update(repr(list(row)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _remove_later(path):
+    # Datei ist evtl. noch vom Druckprogramm geöffnet -> beim Beenden erneut versuchen
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        atexit.register(_remove_quietly, path)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _spool_file():
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(delete=False, dir=SPOOL_DIR, prefix="druck-", suffix=".pdf")
+    tmp.close()
+    atexit.register(_remove_quietly, tmp.name)
+    return tmp.name
+
+
+def _clean_spool():
+    try:
+        entries = list(os.scandir(SPOOL_DIR))
+    except OSError:
+        return
+    cutoff = datetime.datetime.now().timestamp() - SPOOL_MAX_AGE_S
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # noch im Druck
 
 class PrintWindow(ctk.CTkToplevel):
     def __init__(self, master, columns, rows):
@@ -61,10 +123,22 @@ class PrintWindow(ctk.CTkToplevel):
         self.printer_menu = ctk.CTkOptionMenu(options_frame, values=printers, variable=self.printer_var)
         self.printer_menu.pack(anchor="w", padx=5, pady=5)
 
+        self.zoom_var = tk.StringVar(value="150 %")
+        ctk.CTkLabel(options_frame, text="Zoom:").pack(anchor="w", padx=5, pady=(10, 0))
+        ctk.CTkOptionMenu(options_frame, values=list(PREVIEW_ZOOMS), variable=self.zoom_var,
+                          command=self._on_zoom).pack(anchor="w", padx=5, pady=5)
+
         btn_frame = ctk.CTkFrame(options_frame)
         btn_frame.pack(pady=20, fill="x")
-        ctk.CTkButton(btn_frame, text="Cancel", command=self.destroy).pack(side="right", padx=5)
-        ctk.CTkButton(btn_frame, text="Print", command=self.print_or_save).pack(side="right", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=self._on_close).pack(side="right", padx=5)
+        self.btn_print = ctk.CTkButton(btn_frame, text="Print", command=self.print_or_save)
+        self.btn_print.pack(side="right", padx=5)
+
+        self.progress = ctk.CTkProgressBar(options_frame)
+        self.progress.set(0)
+        self.progress.pack(fill="x", padx=5, pady=(0, 5))
+        self.status_label = ctk.CTkLabel(options_frame, text="", text_color="#6b7280")
+        self.status_label.pack(anchor="w", padx=5)
 
         # ==== preview (right) ====
         preview_frame = ctk.CTkFrame(self)
@@ -73,134 +147,196 @@ class PrintWindow(ctk.CTkToplevel):
         self.canvas = tk.Canvas(preview_frame, bg="grey")
         self.scroll_y = tk.Scrollbar(preview_frame, orient="vertical", command=self.canvas.yview)
         self.scroll_x = tk.Scrollbar(preview_frame, orient="horizontal", command=self.canvas.xview)
-        self.canvas.configure(yscrollcommand=self.scroll_y.set, xscrollcommand=self.scroll_x.set)
+        self.canvas.configure(yscrollcommand=self._on_preview_scroll, xscrollcommand=self.scroll_x.set)
+        self.canvas.bind("<Configure>", self._schedule_render)
 
         self.scroll_y.pack(side="right", fill="y")
         self.scroll_x.pack(side="bottom", fill="x")
         self.canvas.pack(side="left", fill="both", expand=True)
 
-        self.preview_images = []
-        self.preview_path = self.generate_temp_pdf()
-        self.show_preview(self.preview_path)
-
-    def generate_temp_pdf(self):
+        self.pdf_doc = None
+        self.zoom = PREVIEW_ZOOMS[self.zoom_var.get()]
+        self._page_cache = OrderedDict()  # (Seite, Zoom) -> PhotoImage, LRU
+        self._page_items = {}  # Seite -> (Canvas-Item, PhotoImage, volle Auflösung?)
+        self._render_after = None
+        self._temp_files = []
+        _clean_spool()
+        self._job = None
+        self.pdf_bytes = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.generate_pdf()
+
+    def generate_pdf(self):
+        # Einmal rendern: Vorschau, Speichern und Drucken nutzen dieselben Bytes
+        self._pdf_timer = perf.start("ui.print_pdf")
+        self._cache_key = _pdf_cache_key(self.columns, self.rows)
+        data = _pdf_cache.get(self._cache_key)
+        if data is not None:
+            _pdf_cache.move_to_end(self._cache_key)
+            self._on_pdf_ready(data)
+            return
+        # reportlab läuft in einem eigenen Prozess, das Fenster bleibt bedienbar
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        path = tmp.name
         tmp.close()
-        self.generate_pdf(path)
-        return path
-
-    def _footer(self, canv: rl_canvas.Canvas, doc):
-        page_num = canv.getPageNumber()
-        text = f"Page {page_num} | Generated {datetime.date.today().strftime('%d.%m.%Y')}"
-        canv.setFont("Helvetica", 8)
-        canv.setFillColor(colors.grey)
-        canv.drawRightString(landscape(A4)[0] - 10, 20, text)
-
-    def _header(self, canv: rl_canvas.Canvas, doc):
-        pass
-
-    def generate_pdf(self, path):
-        styles = getSampleStyleSheet()
-
-        header_style = ParagraphStyle(
-            "header",
-            parent=styles["Normal"],
-            alignment=0,
-            fontName="Helvetica-Bold",
-            fontSize=8,
-            leading=9
-        )
-        body_style = ParagraphStyle(
-            "body",
-            parent=styles["Normal"],
-            alignment=0,
-            fontName="Helvetica",
-            fontSize=8,
-            leading=9
-        )
-        title_style = ParagraphStyle(
-            "title",
-            parent=styles["Normal"],
-            alignment=1,
-            fontName="Helvetica-Bold",
-            fontSize=14,
-            leading=16,
-            spaceAfter=12
-        )
-
-        elements = [Paragraph("sweetNote – Patientenverwaltung", title_style)]
-
-        header_row = [
-            Paragraph(str(c).replace(" ", "<br/>"), header_style)
-            for c in self.columns
-        ]
-
-        data = [header_row]
-        for row in self.rows:
-            data.append([Paragraph(str(c), body_style) for c in row])
-
-        # Calculate column widths
-        total_width = landscape(A4)[0] - 20
-        id_width = 40
-        date_width = 60
-        geb_width = 60
-        other_cols = len(self.columns) - 3
-        col_widths = []
-        for col in self.columns:
-            if col.lower() == "id":
-                col_widths.append(id_width)
-            elif col.lower() in ("date", "datum"):
-                col_widths.append(date_width)
-            elif col.lower().startswith("geb"):
-                col_widths.append(geb_width)
-            else:
-                col_widths.append((total_width - id_width - date_width - geb_width) / other_cols)
-
-
-        table = Table(data, colWidths=col_widths, repeatRows=1)
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 8),
-            ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-            ("BACKGROUND", (0, 1), (-1, -1), colors.whitesmoke),
-            ("GRID", (0, 0), (-1, -1), 0.25, colors.black),
-        ]))
-
-        elements.append(table)
-
-        doc = SimpleDocTemplate(
-            path,
-            pagesize=landscape(A4),
-            leftMargin=10,
-            rightMargin=10,
-            topMargin=20,
-            bottomMargin=20
-        )
-        doc.build(elements, onFirstPage=self._add_page, onLaterPages=self._add_page)
-
-    def _add_page(self, canv, doc):
-        self._footer(canv, doc)
-
-    def show_preview(self, pdf_path):
+        self._temp_files.append(tmp.name)
+        self._job = PdfBuildJob(render_table_pdf, tmp.name, list(self.columns), [list(r) for r in self.rows],
+                                progressive=True)
+        self._job.start()
+        self.btn_print.configure(state="disabled")
+        self.status_label.configure(text="PDF wird erstellt…")
+        self.after(100, self._poll_pdf)
+
+    def _poll_pdf(self):
+        job = self._job
+        if job is None:
+            return
+        finished = job.poll()
+        if job.preview is not None:
+            # Erste Seiten schon anzeigen, das vollständige PDF ersetzt sie später
+            self.show_preview(job.preview)
+            job.preview = None
+        if job.rows_done is not None:
+            self.progress.set(min(job.rows_done / max(len(self.rows), 1), 1.0))
+        if job.pages:
+            self.status_label.configure(text=f"PDF wird erstellt… Seite {job.pages}")
+        if not finished:
+            self.after(100, self._poll_pdf)
+            return
+
+        self._job = None
+        if job.error is not None:
+            self.status_label.configure(text="PDF-Erstellung fehlgeschlagen")
+            messagebox.showerror("Error", f"PDF generation failed:\n{job.error}")
+            return
+        with open(job.path, "rb") as f:
+            data = f.read()
+        self._temp_files.remove(job.path)
+        _remove_later(job.path)
+        _pdf_cache[self._cache_key] = data
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+        self._on_pdf_ready(data)
+
+    def _on_pdf_ready(self, data):
+        perf.stop(self._pdf_timer)
+        self.pdf_bytes = data
+        # Scrollposition der Teilvorschau beibehalten
+        top = self.canvas.canvasy(0) if self.pdf_doc is not None else 0
+        self.show_preview(data)
+        self.canvas.yview_moveto(top / max(self.pdf_doc.page_count * self._page_step - PREVIEW_GAP, 1))
+        self.progress.set(1)
+        self.status_label.configure(text=f"{self.pdf_doc.page_count} Seiten")
+        self.btn_print.configure(state="normal")
+
+    def show_preview(self, pdf_bytes):
+        if self.pdf_doc is not None:
+            self.pdf_doc.close()
+        self.pdf_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        self._page_cache.clear()
+        self._layout_preview()
+
+    def _layout_preview(self):
+        # Weiße Platzhalter für alle Seiten, gerendert wird erst beim Sichtbarwerden
         self.canvas.delete("all")
-        self.preview_images.clear()
-        doc = fitz.open(pdf_path)
-        y_offset = 0
-        for page in doc:
-            pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            photo = ImageTk.PhotoImage(img)
-            self.preview_images.append(photo)
-            self.canvas.create_image(0, y_offset, anchor="nw", image=photo)
-            y_offset += photo.height() + 20
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self._page_items.clear()
+        rect = self.pdf_doc[0].rect
+        self._page_w = int(rect.width * self.zoom)
+        self._page_h = int(rect.height * self.zoom)
+        self._page_step = self._page_h + PREVIEW_GAP
+        for page in range(self.pdf_doc.page_count):
+            y = page * self._page_step
+            self.canvas.create_rectangle(0, y, self._page_w, y + self._page_h, fill="white", outline="")
+        self.canvas.config(scrollregion=(0, 0, self._page_w, self.pdf_doc.page_count * self._page_step - PREVIEW_GAP))
+        self._schedule_render()
+
+    def _on_preview_scroll(self, first, last):
+        self.scroll_y.set(first, last)
+        self._schedule_render()
+
+    def _on_zoom(self, label):
+        self.zoom = PREVIEW_ZOOMS[label]
+        if self.pdf_doc is None:
+            return
+        position = self.canvas.yview()[0]
+        self._layout_preview()
+        self.canvas.yview_moveto(position)
+
+    def _schedule_render(self, event=None):
+        if self._render_after is None and self.pdf_doc is not None:
+            self._render_after = self.after_idle(self._render_visible)
+
+    def _visible_pages(self):
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = max(int(top // self._page_step), 0)
+        last = min(int(bottom // self._page_step), self.pdf_doc.page_count - 1)
+        # Sichtbare Seiten zuerst, dann je eine Seite davor und danach
+        pages = list(range(first, last + 1))
+        pages += [p for p in (first - 1, last + 1) if 0 <= p < self.pdf_doc.page_count]
+        return pages
+
+    def _render_visible(self):
+        # Pro Aufruf höchstens eine Seite in voller Auflösung, damit die Oberfläche reagiert
+        self._render_after = None
+        if self.pdf_doc is None:
+            return
+        wanted = self._visible_pages()
+        for page in [p for p in self._page_items if p not in wanted]:
+            # Bild außerhalb des Sichtbereichs freigeben (bleibt ggf. im LRU-Cache)
+            self.canvas.delete(self._page_items.pop(page)[0])
+        for page in wanted:
+            if page not in self._page_items:
+                photo = self._page_cache.get((page, self.zoom))
+                if photo is not None:
+                    self._page_cache.move_to_end((page, self.zoom))
+                    self._place_page(page, photo, True)
+                else:
+                    self._place_page(page, self._render_page(page, PREVIEW_PLACEHOLDER_SCALE), False)
+        for page in wanted:
+            if not self._page_items[page][2]:
+                photo = self._render_page(page, 1.0)
+                self._page_cache[(page, self.zoom)] = photo
+                while len(self._page_cache) > PREVIEW_CACHE_PAGES:
+                    self._page_cache.popitem(last=False)
+                self._place_page(page, photo, True)
+                self._render_after = self.after(1, self._render_visible)
+                return
+
+    def _render_page(self, page, scale):
+        # scale < 1: grobe Vorschau, auf Seitengröße hochskaliert
+        pix = self.pdf_doc[page].get_pixmap(matrix=fitz.Matrix(self.zoom * scale, self.zoom * scale))
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        if scale != 1.0:
+            img = img.resize((self._page_w, self._page_h), Image.BILINEAR)
+        return ImageTk.PhotoImage(img)
+
+    def _place_page(self, page, photo, full):
+        old = self._page_items.get(page)
+        item = self.canvas.create_image(0, page * self._page_step, anchor="nw", image=photo)
+        if old is not None:
+            self.canvas.delete(old[0])
+        self._page_items[page] = (item, photo, full)
+
+    def _on_close(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        if self._render_after is not None:
+            self.after_cancel(self._render_after)
+            self._render_after = None
+        self._page_items.clear()
+        self._page_cache.clear()
+        if self.pdf_doc is not None:
+            self.pdf_doc.close()
+            self.pdf_doc = None
+        for path in self._temp_files:
+            _remove_later(path)
+        self._temp_files.clear()
+        self.destroy()
 
     def print_or_save(self):
+        if self.pdf_bytes is None:
+            return
         filename = self.filename_entry.get().strip()
         if not filename.endswith(".pdf"):
             filename += ".pdf"
@@ -214,11 +350,11 @@ class PrintWindow(ctk.CTkToplevel):
             if not file_path:
                 return
         else:
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-            file_path = tmp.name
-            tmp.close()
+            # Nicht in _temp_files: beim Schließen des Fensters wird evtl. noch gedruckt
+            file_path = _spool_file()
 
-        self.generate_pdf(file_path)
+        with open(file_path, "wb") as f:
+            f.write(self.pdf_bytes)
 
         if self.printer_var.get() == "Save as PDF":
             messagebox.showinfo("Export", f"PDF saved:\n{file_path}")
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from Frontend.Info_window import AboutWindow
+from Frontend.perf_window import PerformanceWindow
 import os
 
 class SettingsWindow(ctk.CTkToplevel):
@@ -10,7 +11,7 @@ class SettingsWindow(ctk.CTkToplevel):
         self.config = config
         self.on_apply = on_apply
         self.title("Einstellungen")
-        self.geometry("460x260")
+        self.geometry("460x300")
         self.attributes("-topmost", True)
         self.focus_force()
         self.grab_set()
@@ -44,6 +45,11 @@ class SettingsWindow(ctk.CTkToplevel):
         browse_btn = ctk.CTkButton(wrapper, text="Browse…", width=90, command=browse_db)
         browse_btn.grid(row=2, column=2, sticky="w", padx=6, pady=4)
 
+        ctk.CTkLabel(wrapper, text="Performance-Messung").grid(row=3, column=0, sticky="w", padx=6, pady=4)
+        self.perf_var = ctk.BooleanVar(value=bool(config.get("perf_enabled", False)))
+        perf_switch = ctk.CTkSwitch(wrapper, text="ab nächstem Start", variable=self.perf_var)
+        perf_switch.grid(row=3, column=1, sticky="w", padx=6, pady=4)
+
         info = ctk.CTkLabel(wrapper, text=f"Config file: {self.config.file_path}", text_color="#6b7280")
         info.grid(row=4, column=0, columnspan=3, sticky="w", padx=6, pady=(16,8))
 
@@ -52,6 +58,8 @@ class SettingsWindow(ctk.CTkToplevel):
 
         info_btn = ctk.CTkButton(btns, text="Info", width=100, command=lambda: AboutWindow(self, self.config))
         info_btn.pack(side="left", padx=6)
+        perf_btn = ctk.CTkButton(btns, text="Performance", width=100, command=lambda: PerformanceWindow(self, self.config))
+        perf_btn.pack(side="left", padx=6)
 
         save_btn = ctk.CTkButton(btns, text="Save", width=110, command=self.apply_and_close)
         save_btn.pack(side="right", padx=(6,0))
@@ -64,6 +72,7 @@ class SettingsWindow(ctk.CTkToplevel):
         self.config.set("appearance_mode", self.appearance_var.get().lower())
         self.config.set("prefill_date_on_new", bool(self.prefill_var.get()))
         self.config.set("db_path", self.db_var.get())
+        self.config.set("perf_enabled", bool(self.perf_var.get()))
 
         try:
             self.config.save()
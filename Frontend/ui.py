@@ -17,16 +17,32 @@
 # ===========================================================
 
 import sys, os
+import multiprocessing
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import customtkinter as ctk
 from Utils.config import Config
+from Utils import perf
+from Data.Mssql import query_audit
 from Manager.customer_manager import CustomerManager
 from Frontend.main_window import MainWindow
 
 def main():
     config = Config()
     db_path = config.get("db_path", "data/customers.db")
-    manager = CustomerManager(db_path=db_path)
+    if config.get("perf_enabled", False):
+        perf.enable(int(config.get("perf_window", perf.WINDOW)))
+    manager = CustomerManager(
+        db_path=db_path,
+        cache_size=int(config.get("customer_cache_size", 1024)),
+        reader_pool_size=int(config.get("reader_pool_size", 4)),
+    )
+    # sort_key läuft pro Zeile, snapshot/subscribe sind reine Verwaltung
+    perf.instrument(manager, "CustomerManager", skip=("sort_key", "snapshot", "subscribe", "unsubscribe"))
+    if config.get("sql_audit", False):
+        # Diagnose: Abfragepläne im Hintergrund prüfen, Befunde landen auf der Konsole
+        threading.Thread(target=query_audit.audit_database, args=(manager.db_path,),
+                         name="sweetNote-sql-audit", daemon=True).start()
     ctk.set_appearance_mode(config.get("appearance_mode", "light"))
     ctk.set_default_color_theme("dark-blue")
     app = MainWindow(manager, config)
@@ -34,4 +50,6 @@ def main():
     manager.close()
 
 if __name__ == "__main__":
+    # PDF-Prozesse (Utils/pdf_worker) im PyInstaller-Build
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
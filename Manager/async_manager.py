@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class AsyncCustomerManager:
+    # Führt alle CustomerManager-Aufrufe auf einem eigenen DB-Thread aus.
+    # Ergebnisse kommen über root.after() zurück in den Tk-Thread.
+    def __init__(self, manager, root, poll_ms: int = 15, on_busy=None, frame_budget_ms: int = 12, max_chunks: int = 4):
+        self.manager = manager
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy
+        # Pro Tick höchstens so lange Callbacks ausführen, der Rest folgt im nächsten Tick
+        self.frame_budget = frame_budget_ms / 1000
+        self._requests = queue.Queue()
+        self._done = queue.Queue()
+        self._events = queue.Queue()
+        # Gegendruck für stream(): der DB-Thread liest höchstens max_chunks Blöcke voraus
+        self._chunk_slots = threading.Semaphore(max_chunks)
+        self._listeners = []
+        self._latest = {}
+        self._pending = 0
+        self._closed = False
+        self.manager.subscribe(self._on_change)
+        self._thread = threading.Thread(target=self._run, name="sweetNote-db", daemon=True)
+        self._thread.start()
+        self._after_id = self.root.after(self.poll_ms, self._drain)
+
+    def submit(self, method, *args, callback=None, errback=None, key=None, **kwargs) -> Future:
+        # method: Name einer CustomerManager-Methode oder ein Callable(manager, ...)
+        # key: neuere Anfragen mit gleichem key verdrängen ältere (z.B. "search")
+        future = Future()
+        self._enqueue(future, method, args, kwargs, callback, errback, key)
+        return future
+
+    def stream(self, method, *args, on_chunk=None, callback=None, errback=None, key=None, **kwargs) -> Future:
+        # method liefert einen Iterator von Blöcken (z.B. iter_search_customers).
+        # on_chunk(block) läuft im Tk-Thread, callback(anzahl) am Ende.
+        # Wird die Anfrage über key verdrängt, bricht der DB-Thread nach dem aktuellen Block ab.
+        future = Future()
+
+        def pump(manager):
+            chunks = self._call(manager, method, args, kwargs)
+            count = 0
+            try:
+                for chunk in chunks:
+                    if not self._acquire_slot(future, key):
+                        break
+                    self._done.put(("chunk", (future, key, on_chunk, chunk)))
+                    count += len(chunk)
+            finally:
+                close = getattr(chunks, "close", None)
+                if close:
+                    close()
+            return count
+
+        self._enqueue(future, pump, (), {}, callback, errback, key)
+        return future
+
+    def _enqueue(self, future, method, args, kwargs, callback, errback, key):
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = future
+        self._set_pending(self._pending + 1)
+        self._requests.put((future, method, args, kwargs, callback, errback, key))
+
+    def _acquire_slot(self, future, key):
+        while not self._closed:
+            if key is not None and self._latest.get(key) is not future:
+                return False
+            if self._chunk_slots.acquire(timeout=0.05):
+                return True
+        return False
+
+    @staticmethod
+    def _call(manager, method, args, kwargs):
+        if callable(method):
+            return method(manager, *args, **kwargs)
+        return getattr(manager, method)(*args, **kwargs)
+
+    def subscribe(self, listener):
+        # listener(kind, payload) wie CustomerManager.subscribe, aber im Tk-Thread
+        self._listeners.append(listener)
+
+    def _on_change(self, kind, payload):
+        self._events.put((kind, payload))
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            future, method, args, kwargs = item[:4]
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = self._call(self.manager, method, args, kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            self._done.put(("done", item))
+
+    def _drain(self):
+        # Erst die Änderungen, dann die Ergebnisse: Callbacks sehen die Tabelle schon aktualisiert
+        while True:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            for listener in list(self._listeners):
+                self._safe_call(listener, kind, payload)
+        deadline = time.perf_counter() + self.frame_budget
+        while time.perf_counter() < deadline:
+            try:
+                kind, item = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "chunk":
+                self._deliver_chunk(*item)
+            else:
+                self._deliver(*item)
+        if not self._closed:
+            self._after_id = self.root.after(self.poll_ms, self._drain)
+
+    def _deliver_chunk(self, future, key, on_chunk, chunk):
+        self._chunk_slots.release()
+        if key is not None and self._latest.get(key) is not future:
+            return  # von einer neueren Anfrage überholt
+        if on_chunk:
+            self._safe_call(on_chunk, chunk)
+
+    def _deliver(self, future, _method, _args, _kwargs, callback, errback, key):
+        self._set_pending(self._pending - 1)
+        if key is not None:
+            if self._latest.get(key) is not future:
+                return  # von einer neueren Anfrage überholt
+            del self._latest[key]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if errback:
+                self._safe_call(errback, error)
+            else:
+                self.root.report_callback_exception(type(error), error, error.__traceback__)
+        elif callback:
+            self._safe_call(callback, future.result())
+
+    def _safe_call(self, func, *args):
+        # Ein fehlerhafter Callback darf die Poll-Schleife nicht beenden
+        try:
+            func(*args)
+        except Exception as e:
+            self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+    def _set_pending(self, value):
+        was_busy = self._pending > 0
+        self._pending = value
+        if self.on_busy and was_busy != (value > 0):
+            self.on_busy(value > 0)
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def cancel(self, key) -> None:
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.manager.unsubscribe(self._on_change)
+        try:
+            self.root.after_cancel(self._after_id)
+        except Exception:
+            pass
+        self._requests.put(None)
+        self._thread.join(timeout)
@@ -1,61 +1,699 @@
+import contextlib
+import functools
 import os
+import pathlib
+import queue
+import re
 import sqlite3
+import string
+import threading
+import time
+from collections import OrderedDict
 from Domain.customer import Customer
 from Data.Mssql import sql_commands as sql
+from Data.Mssql import migrations
+from Utils import perf
+from Utils.phonetik import edit_distance, koelner_phonetik
+from Utils.validierung import to_iso_date
+
+# Spalten, die beim Einfügen gesetzt werden (id vergibt SQLite)
+INSERT_FIELDS = ("date", "lastName", "firstName", "birthDate", "address", "telephoneNumber",
+                 "email", "insurance", "doctor", "pretreatment", "reason")
+
+# Wartezeit auf Sperren anderer Verbindungen, danach Wiederholungen mit Backoff
+BUSY_TIMEOUT_MS = 5000
+BUSY_RETRIES = 4
+BUSY_BACKOFF_S = 0.05
+
+# COLLATE NOCASE faltet nur A-Z
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Obergrenze für Präfix-Bereiche (>= p AND < p + _PREFIX_END)
+_PREFIX_END = "\U0010ffff"
+# Phonetische Suche: höchstens so viele Schreibweisen je Schlüssel bewerten
+MAX_PHONETIC_SPELLINGS = 100
+# Ab so vielen Ziffern ist eine Suche aus Ziffern und Trennzeichen eine Telefonnummer (PLZ hat 5)
+PHONE_QUERY_MIN_DIGITS = 6
+
+
+def fold_name(value):
+    # Python-Gegenstück zu sql.NORMALIZED_COLUMNS["lastName_fold"/"firstName_fold"]
+    value = (value or "").replace("ẞ", "ss").replace("Ä", "ä").replace("Ö", "ö").replace("Ü", "ü")
+    return value.translate(_NOCASE).replace("ß", "ss")
+
+
+def phone_digits(value):
+    # Python-Gegenstück zu sql.NORMALIZED_COLUMNS["phone_digits"]
+    value = value or ""
+    stripped = value.lstrip()
+    if stripped[:3] == "+49":
+        value = "0" + stripped[3:]
+    elif stripped[:4] == "0049":
+        value = "0" + stripped[4:]
+    for sep in sql.PHONE_SEPARATORS:
+        value = value.replace(sep, "")
+    return value
+
+
+def customer_row_factory(cursor, row):
+    # Baut den Customer direkt aus dem Tupel (Spalten laut sql.CUSTOMER_COLUMNS)
+    return Customer(*row)
+
+
+class OperationCancelled(Exception):
+    pass
+
+
+def _locked(method):
+    # Schreibverbindung: immer nur ein Thread gleichzeitig
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _is_busy(error):
+    name = getattr(error, "sqlite_errorname", "") or ""
+    if name.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")):
+        return True
+    return "database is locked" in str(error) or "database is busy" in str(error)
+
+
+def _retry_busy(method):
+    # SQLITE_BUSY trotz busy_timeout (z.B. Checkpoint, anderer Prozess) -> kurz warten und neu versuchen
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        for attempt in range(BUSY_RETRIES):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == BUSY_RETRIES - 1:
+                    raise
+                time.sleep(BUSY_BACKOFF_S * (2 ** attempt))
+    return wrapper
+
 
 class CustomerManager:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, cache_size: int = 1024, reader_pool_size: int = 4):
         self.db_path = os.path.abspath(db_path)
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        # LRU-Cache id -> Customer; wird von den Schreibmethoden gepflegt
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.RLock()
+        # Zählt Löschungen/Leerungen: ein Lesestand von davor darf nicht mehr in den Cache
+        self._cache_generation = 0
+        self._data_version = None
+        # Lesezugriffe laufen über eigene read-only Verbindungen (WAL: parallel zum Schreiben)
+        self.reader_pool_size = max(1, reader_pool_size)
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners = []
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000,
+                                    factory=perf.connection_factory())
+        self.conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
         self.conn.execute("PRAGMA journal_mode = WAL;")
+        self.conn.execute("PRAGMA synchronous = NORMAL;")
         self.conn.execute("PRAGMA foreign_keys = ON;")
         self._create_table()
+        # Eigene Verbindung nur für PRAGMA data_version: unabhängig von self.lock (lange Importe).
+        # Sie sieht auch die Commits des Writers, _commit() übernimmt deren Stand sofort.
+        self._version_conn = self._open_reader()
+        self._version_lock = threading.Lock()
+        self._data_version = self._read_data_version()
 
     def _create_table(self):
-        self.conn.execute(sql.CREATE_CUSTOMER_TABLE)
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(lastName, firstName);")
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email);")
+        # Schema über versionierte Migrationen (PRAGMA user_version), der FTS-Index hängt an der SQLite-Version
+        migrations.migrate(self.conn)
+        self._create_fts_index()
         self.conn.commit()
 
-    def add_customer(self, **data):
-        data.pop("id", None)
-        cur = self.conn.execute(sql.INSERT_CUSTOMER, data)
+    def _create_fts_index(self):
+        # Bestehende Datenbanken bekommen den Index beim ersten Start einmalig aufgebaut
+        try:
+            exists = self.conn.execute(sql.FTS_TABLE_EXISTS).fetchone() is not None
+            self.conn.execute(sql.CREATE_CUSTOMER_FTS)
+            for trigger in sql.CREATE_CUSTOMER_FTS_TRIGGERS:
+                self.conn.execute(trigger)
+            if not exists:
+                self.conn.execute(sql.REBUILD_CUSTOMER_FTS)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite ohne FTS5 -> LIKE-Suche
+            self.fts_enabled = False
+
+    @staticmethod
+    def _normalize_dates(data):
+        for field in ("date", "birthDate"):
+            if field in data:
+                data[field] = to_iso_date(data[field])
+        return data
+
+    @staticmethod
+    def _order(sort_by, reverse):
+        if sort_by not in sql.SORT_KEYS:
+            raise ValueError(f"Unbekannte Sortierspalte: {sort_by}")
+        return sql.SORT_KEYS[sort_by], "DESC" if reverse else "ASC"
+
+    # ==== Verbindungen ====
+    def _open_reader(self):
+        uri = pathlib.Path(self.db_path).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                               timeout=BUSY_TIMEOUT_MS / 1000, factory=perf.connection_factory())
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+        return conn
+
+    @contextlib.contextmanager
+    def _reader(self):
+        pinned = getattr(self._local, "snapshot", None)
+        if pinned is not None:
+            yield pinned
+            return
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                create = self._reader_count < self.reader_pool_size
+                if create:
+                    self._reader_count += 1
+            if create:
+                try:
+                    conn = self._open_reader()
+                except BaseException:
+                    with self._reader_lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextlib.contextmanager
+    def snapshot(self):
+        # Alle Lesezugriffe dieses Threads im Block sehen denselben Datenstand (z.B. lange Exporte)
+        if getattr(self._local, "snapshot", None) is not None:
+            yield
+            return
+        with self._reader() as conn:
+            conn.execute("BEGIN")
+            self._local.snapshot = conn
+            try:
+                yield
+            finally:
+                self._local.snapshot = None
+                conn.execute("COMMIT")
+
+    @contextlib.contextmanager
+    def _write(self):
+        # Schreibtransaktion auf der Writer-Verbindung (Aufrufer hält self.lock)
+        try:
+            yield self.conn
+            self._commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def _fetch_customers(self, stmt, params=()):
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = customer_row_factory
+            return cursor.execute(stmt, params).fetchall()
+
+    def _iter_chunks(self, stmt, params=(), chunk_size=1000):
+        # Ergebnis blockweise per fetchmany; ein einzelnes SELECT liest immer einen festen Datenstand
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = customer_row_factory
+            try:
+                cursor.execute(stmt, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cursor.close()
+
+    def _fetch_value(self, stmt, params=()):
+        with self._reader() as conn:
+            return conn.execute(stmt, params).fetchone()[0]
+
+    def _commit(self):
+        # Der eigene Commit ändert data_version auf _version_conn ebenfalls: Stand direkt danach übernehmen,
+        # damit nur fremde Commits den Cache leeren. Fremde Commits vor dieser Transaktion fängt die
+        # Prüfung davor ab (während der Transaktion kann kein anderer schreiben).
+        self._check_data_version()
         self.conn.commit()
-        new_id = cur.lastrowid
-        return self.get_customer_by_id(new_id)
+        with self._cache_lock:
+            self._data_version = self._read_data_version()
+
+    # ==== Cache ====
+    def _read_data_version(self):
+        with self._version_lock:
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_data_version(self):
+        # data_version ändert sich, sobald eine andere Verbindung committet (anderer Prozess, eigener Writer
+        # außerhalb von _commit)
+        version = self._read_data_version()
+        with self._cache_lock:
+            if version != self._data_version:
+                self.clear_cache()
+                self._data_version = version
+
+    def _cache_get(self, id):
+        with self._cache_lock:
+            customer = self._cache.get(id)
+            if customer is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(id)
+            return customer
+
+    def _cache_put(self, customer, overwrite=True, generation=None):
+        # generation: Stand von _cache_generation vor dem Lesen (nur für gelesene Zeilen)
+        if self.cache_size <= 0:
+            return customer
+        with self._cache_lock:
+            if generation is not None and generation != self._cache_generation:
+                return customer
+            cached = self._cache.get(customer.id)
+            if cached is not None:
+                if overwrite:
+                    # Identität erhalten: vorhandenes Objekt aktualisieren
+                    cached.update_details(**customer.to_dict())
+                customer = cached
+            self._cache[customer.id] = customer
+            self._cache.move_to_end(customer.id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return customer
 
+    def _cache_drop(self, ids):
+        with self._cache_lock:
+            self._cache_generation += 1
+            for id in ids:
+                self._cache.pop(id, None)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._cache.clear()
+
+    def cache_stats(self):
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "capacity": self.cache_size,
+            }
+
+    # ==== Änderungs-Events ====
+    def subscribe(self, listener):
+        # listener(kind, payload) nach jedem Commit, im schreibenden Thread:
+        # "added"/"updated" -> Customer, "deleted" -> Liste von ids, "reset" -> None (viele Zeilen geändert)
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, kind, payload=None):
+        for listener in list(self._listeners):
+            listener(kind, payload)
+
+    @_retry_busy
+    @_locked
+    def add_customer(self, **data):
+        data = self._clean_record(data)
+        with self._write() as conn:
+            cur = conn.execute(sql.INSERT_CUSTOMER, self._with_phonetic(data))
+        customer = self._cache_put(Customer(cur.lastrowid, **data))
+        self._emit("added", customer)
+        return customer
+
+    @_locked
+    def bulk_insert(self, records, replace=False, batch_size=1000, atomic=False, progress=None, cancel=None):
+        # Import in Blöcken per executemany; "replace"/atomic laufen komplett in einer Transaktion
+        # progress(count) wird nach jedem Block gerufen, cancel ist ein threading.Event
+        single_tx = replace or atomic
+        count = 0
+        try:
+            if replace:
+                self.conn.execute(sql.DELETE_ALL_CUSTOMERS)
+                self.clear_cache()
+            batch = []
+            for record in records:
+                batch.append(self._with_phonetic(self._clean_record(record)))
+                if len(batch) >= batch_size:
+                    count += self._insert_batch(batch, not single_tx, progress, cancel, count)
+                    batch = []
+            if batch:
+                count += self._insert_batch(batch, not single_tx, progress, cancel, count)
+            self._commit()
+        except BaseException:
+            self.conn.rollback()
+            if count and not single_tx:
+                self._emit("reset")  # bereits committete Blöcke bleiben erhalten
+            raise
+        self._emit("reset")
+        return count
+
+    def _insert_batch(self, batch, commit, progress, cancel, done):
+        if cancel is not None and cancel.is_set():
+            raise OperationCancelled()
+        self.conn.executemany(sql.INSERT_CUSTOMER, batch)
+        if commit:
+            self._commit()
+        if progress:
+            progress(done + len(batch))
+        return len(batch)
+
+    @staticmethod
+    def _clean_record(record):
+        # Unbekannte Schlüssel (z.B. "id" aus einem Export) werden verworfen
+        if not isinstance(record, dict):
+            raise ValueError(f"Ungültiger Datensatz: {record!r}")
+        return CustomerManager._normalize_dates({field: record.get(field) or "" for field in INSERT_FIELDS})
+
+    @staticmethod
+    def _with_phonetic(data):
+        # Nur für die Schreibanweisung, Customer selbst kennt die Schlüsselspalten nicht
+        return dict(data, lastName_phon=koelner_phonetik(data["lastName"]),
+                    firstName_phon=koelner_phonetik(data["firstName"]))
+
+    @_retry_busy
+    @_locked
     def update_customer(self, id, **data):
-        data["id"] = id
-        self.conn.execute(sql.UPDATE_CUSTOMER, data)
-        self.conn.commit()
-        return self.get_customer_by_id(id)
+        data = self._clean_record(data)
+        with self._write() as conn:
+            cur = conn.execute(sql.UPDATE_CUSTOMER, dict(self._with_phonetic(data), id=id))
+        if cur.rowcount == 0:
+            self._cache_drop([id])
+            self._emit("deleted", [id])
+            return None
+        customer = self._cache_put(Customer(id, **data))
+        self._emit("updated", customer)
+        return customer
 
+    @_retry_busy
+    @_locked
     def delete_customer_by_id(self, id):
-        self.conn.execute(sql.DELETE_CUSTOMER, {"id": id})
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute(sql.DELETE_CUSTOMER, {"id": id})
+        self._cache_drop([id])
+        self._emit("deleted", [id])
+
+    @_retry_busy
+    @_locked
+    def delete_many(self, ids):
+        # Alle IDs in einer Transaktion
+        ids = list(ids)
+        with self._write() as conn:
+            cur = conn.executemany(sql.DELETE_CUSTOMER, ({"id": id} for id in ids))
+        self._cache_drop(ids)
+        self._emit("deleted", ids)
+        return cur.rowcount
+
+    @staticmethod
+    def _date_range(start, end):
+        # date-Objekte oder Strings (TT.MM.JJJJ / JJJJ-MM-TT), beide Grenzen inklusive
+        return {
+            "start": start.isoformat() if hasattr(start, "isoformat") else to_iso_date(start),
+            "end": end.isoformat() if hasattr(end, "isoformat") else to_iso_date(end),
+        }
+
+    @_retry_busy
+    def count_customers_in_range(self, start, end):
+        return self._fetch_value(sql.COUNT_CUSTOMERS_IN_RANGE, self._date_range(start, end))
+
+    @_retry_busy
+    @_locked
+    def delete_customers_in_range(self, start, end):
+        with self._write() as conn:
+            cur = conn.execute(sql.DELETE_CUSTOMERS_IN_RANGE, self._date_range(start, end))
+        self.clear_cache()
+        self._emit("reset")
+        return cur.rowcount
 
-    def get_all_customers(self):
-        cursor = self.conn.execute(sql.SELECT_ALL_CUSTOMERS)
-        return [Customer(**row) for row in map(dict, cursor.fetchall())]
+    @_retry_busy
+    def get_all_customers(self, sort_by=None, reverse=False):
+        if sort_by is None:
+            return self._fetch_customers(sql.SELECT_ALL_CUSTOMERS)
+        key, order = self._order(sort_by, reverse)
+        return self._fetch_customers(sql.SELECT_ALL_CUSTOMERS_ORDERED.format(key=key, order=order))
 
+    def iter_customers(self, sort_by=None, reverse=False, chunk_size=1000):
+        # Wie get_all_customers, aber als Generator: nur chunk_size Kunden gleichzeitig im Speicher
+        if sort_by is None:
+            stmt = sql.SELECT_ALL_CUSTOMERS
+        else:
+            key, order = self._order(sort_by, reverse)
+            stmt = sql.SELECT_ALL_CUSTOMERS_ORDERED.format(key=key, order=order)
+        for rows in self._iter_chunks(stmt, (), chunk_size):
+            yield from rows
+
+    @_retry_busy
+    def count_customers(self):
+        return self._fetch_value(sql.COUNT_CUSTOMERS)
+
+    @_retry_busy
+    def get_customers_page(self, sort_by="id", reverse=False, after=None, before=None, limit=200):
+        # Keyset-Paging: after/before sind Cursor aus sort_key() (erste bzw. letzte Zeile der Seite), kein OFFSET
+        key, _ = self._order(sort_by, reverse)
+        backwards = before is not None
+        descending = reverse != backwards
+        cursor = before if backwards else after
+        params = {"limit": limit}
+        where = ""
+        if cursor is not None:
+            where = sql.KEYSET_WHERE.format(key=key, op="<" if descending else ">")
+            params["key"], params["id"] = cursor
+        stmt = sql.SELECT_CUSTOMERS_PAGE.format(where=where, key=key, order="DESC" if descending else "ASC")
+        rows = self._fetch_customers(stmt, params)
+        if backwards:
+            rows.reverse()
+        return rows
+
+    @staticmethod
+    def sort_key(customer, sort_by="id"):
+        # Python-Gegenstück zu sql.SORT_KEYS (IFNULL + NOCASE): gleiche Reihenfolge wie ORDER BY.
+        # Zugleich der Cursor für get_customers_page(after=/before=)
+        if sort_by == "id":
+            return (customer.id, customer.id)
+        return ((getattr(customer, sort_by) or "").translate(_NOCASE), customer.id)
+
+    def _in_snapshot(self):
+        # Im Snapshot gilt dessen Datenstand: Cache (neuerer Stand) weder lesen noch mit alten Zeilen füllen
+        return getattr(self._local, "snapshot", None) is not None
+
+    @_retry_busy
     def get_customer_by_id(self, id):
-        cursor = self.conn.execute(sql.SELECT_CUSTOMER_BY_ID, {"id": id})
-        row = cursor.fetchone()
-        return Customer(**dict(row)) if row else None
+        if self._in_snapshot():
+            rows = self._fetch_customers(sql.SELECT_CUSTOMER_BY_ID, {"id": id})
+            return rows[0] if rows else None
+        self._check_data_version()
+        customer = self._cache_get(id)
+        if customer is not None:
+            return customer
+        with self._cache_lock:
+            self.cache_misses += 1
+            generation = self._cache_generation
+        rows = self._fetch_customers(sql.SELECT_CUSTOMER_BY_ID, {"id": id})
+        # Ein parallel geschriebener Stand im Cache hat Vorrang vor diesem Lesestand,
+        # wurde inzwischen gelöscht, bleibt er ganz draußen
+        return self._cache_put(rows[0], overwrite=False, generation=generation) if rows else None
+
+    @_retry_busy
+    def get_customers_by_ids(self, ids):
+        # Liefert (Kunden in Reihenfolge von ids, fehlende ids); Abfrage in IN-Blöcken
+        self._check_data_version()
+        ids = list(ids)
+        found = {}
+        todo = []
+        cached = not self._in_snapshot()
+        for id in dict.fromkeys(ids):
+            customer = self._cache_get(id) if cached else None
+            if customer is not None:
+                found[id] = customer
+            else:
+                todo.append(id)
+        if cached:
+            with self._cache_lock:
+                self.cache_misses += len(todo)
+                generation = self._cache_generation
+        for start in range(0, len(todo), sql.MAX_SQL_VARIABLES):
+            chunk = todo[start:start + sql.MAX_SQL_VARIABLES]
+            stmt = sql.SELECT_CUSTOMERS_BY_IDS.format(placeholders=", ".join("?" * len(chunk)))
+            for customer in self._fetch_customers(stmt, chunk):
+                if cached:
+                    customer = self._cache_put(customer, overwrite=False, generation=generation)
+                found[customer.id] = customer
+        customers = [found[id] for id in ids if id in found]
+        missing = [id for id in ids if id not in found]
+        return customers, missing
+
+    @_retry_busy
+    def find_customers_by_name(self, last_name, first_name="", prefix=True, limit=200):
+        # Gleichheit bzw. Präfix auf den gefalteten Namen (groß/klein, Umlaute, ß egal), über Index
+        last, first = fold_name(last_name), fold_name(first_name)
+        end = _PREFIX_END if prefix else "\0"
+        return self._fetch_customers(sql.FIND_CUSTOMERS_BY_NAME, {
+            "last": last, "last_end": last + end,
+            "first": first, "first_end": first + (_PREFIX_END if prefix or not first else "\0"),
+            "limit": limit,
+        })
+
+    @_retry_busy
+    def search_customers(self, query, sort_by=None, reverse=False):
+        # Ohne sort_by nach Relevanz (bm25), sonst per ORDER BY auf der Sortierspalte
+        return self._fetch_customers(*self._search_statement(query, sort_by, reverse))
+
+    @_retry_busy
+    def search_customers_phonetic(self, query, sort_by=None, reverse=False, limit=200):
+        # Ähnlich klingende Namen (Meier/Meyer, Schmidt/Schmitt) über den Index auf den Kölner-Phonetik-Schlüsseln.
+        # Ein Wort sucht in Nach- und Vorname; bei mehreren ist ein Wort der Nachname, der Rest der Vorname.
+        # Ohne sort_by nach Editierdistanz der Schreibweise zur Eingabe, sonst nach Spalte; höchstens limit Treffer.
+        words = [w for w in (query or "").split() if koelner_phonetik(w)]
+        if not words:
+            return []
+        if sort_by is not None:
+            self._order(sort_by, reverse)
+        # Erst die wenigen Schreibweisen bewerten, dann nur für die besten Zeilen laden
+        candidates = []
+        if len(words) == 1:
+            word, key = fold_name(words[0]), koelner_phonetik(words[0])
+            for last in self._phonetic_spellings(sql.NEXT_LAST_SPELLING, key):
+                candidates.append((edit_distance(word, last), 0, last,
+                                   sql.SEARCH_PHONETIC_LAST, {"key": key, "last": last}))
+            for first in self._phonetic_spellings(sql.NEXT_FIRST_SPELLING, key):
+                candidates.append((edit_distance(word, first), 1, first,
+                                   sql.SEARCH_PHONETIC_FIRST, {"key": key, "first": first}))
+        else:
+            for i, last_word in enumerate(words):
+                first_word = " ".join(words[:i] + words[i + 1:])
+                last_key, first_key = koelner_phonetik(last_word), koelner_phonetik(first_word)
+                firsts = self._phonetic_spellings(sql.NEXT_FIRST_SPELLING, first_key)
+                if not firsts:
+                    continue
+                first_distances = [(edit_distance(fold_name(first_word), first), first) for first in firsts]
+                for last in self._phonetic_spellings(sql.NEXT_LAST_SPELLING, last_key):
+                    last_distance = edit_distance(fold_name(last_word), last)
+                    for first_distance, first in first_distances:
+                        candidates.append((last_distance + first_distance, 0, f"{last} {first}",
+                                           sql.SEARCH_PHONETIC_FULL,
+                                           {"last_key": last_key, "last": last, "first_key": first_key, "first": first}))
+        candidates.sort(key=lambda c: c[:3])
+        found = {}
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = customer_row_factory
+            for *_rank, stmt, params in candidates:
+                for customer in cursor.execute(stmt, dict(params, limit=limit - len(found))).fetchall():
+                    found.setdefault(customer.id, customer)
+                if len(found) >= limit:
+                    break
+        customers = list(found.values())
+        if sort_by is not None:
+            customers.sort(key=lambda c: self.sort_key(c, sort_by), reverse=reverse)
+        return customers
 
-    def search_customers(self, query):
-        query = f"%{(query or '').lower()}%"
-        cursor = self.conn.execute(sql.SEARCH_CUSTOMERS, {"query": query})
-        return [Customer(**row) for row in map(dict, cursor.fetchall())]
+    def _phonetic_spellings(self, stmt, key):
+        # Verschiedene gefaltete Namen zu einem Schlüssel, je Schreibweise ein Indexsprung
+        spellings = []
+        with self._reader() as conn:
+            while len(spellings) < MAX_PHONETIC_SPELLINGS:
+                row = conn.execute(stmt, {"key": key, "after": spellings[-1] if spellings else ""}).fetchone()
+                if row is None:
+                    break
+                spellings.append(row[0])
+        return spellings
 
+    def iter_search_customers(self, query, sort_by=None, reverse=False, chunk_size=200):
+        # Wie search_customers, liefert die Treffer aber blockweise (Listen) per fetchmany
+        return self._iter_chunks(*self._search_statement(query, sort_by, reverse), chunk_size)
+
+    @_retry_busy
+    def count_search_results(self, query):
+        digits = self._phone_query(query)
+        if digits:
+            return self._fetch_value(sql.COUNT_SEARCH_CUSTOMERS_PHONE, self._phone_params(digits))
+        if not self.fts_enabled:
+            return self._fetch_value(sql.COUNT_SEARCH_CUSTOMERS_LIKE, {"query": self._like_query(query)})
+        match = self._fts_query(query)
+        if not match:
+            return self.count_customers()
+        return self._fetch_value(sql.COUNT_SEARCH_CUSTOMERS, {"query": match})
+
+    def _search_statement(self, query, sort_by, reverse):
+        if sort_by is not None:
+            key, order = self._order(sort_by, reverse)
+        digits = self._phone_query(query)
+        if digits:
+            # Telefonnummer in beliebiger Schreibweise: Präfix auf phone_digits
+            order_by = f"ORDER BY {key} {order}, id {order}" if sort_by else "ORDER BY phone_digits, id"
+            return sql.SEARCH_CUSTOMERS_PHONE.format(order_by=order_by), self._phone_params(digits)
+        if not self.fts_enabled:
+            order_by = f"ORDER BY {key} {order}, id {order}" if sort_by else ""
+            return sql.SEARCH_CUSTOMERS_LIKE.format(order_by=order_by), {"query": self._like_query(query)}
+        match = self._fts_query(query)
+        if not match:
+            if sort_by is None:
+                return sql.SELECT_ALL_CUSTOMERS, {}
+            return sql.SELECT_ALL_CUSTOMERS_ORDERED.format(key=key, order=order), {}
+        if sort_by is None:
+            return sql.SEARCH_CUSTOMERS, {"query": match}
+        return sql.SEARCH_CUSTOMERS_ORDERED.format(key=key, order=order), {"query": match}
+
+    @staticmethod
+    def _phone_query(query):
+        query = (query or "").strip()
+        if not query or not re.fullmatch(r"[\d\s/().+-]+", query):
+            return None
+        digits = phone_digits(query)
+        return digits if sum(c.isdigit() for c in digits) >= PHONE_QUERY_MIN_DIGITS else None
+
+    @staticmethod
+    def _phone_params(digits):
+        return {"digits": digits, "digits_end": digits + _PREFIX_END}
+
+    @staticmethod
+    def _like_query(query):
+        return f"%{(query or '').lower()}%"
+
+    @staticmethod
+    def _fts_query(query):
+        # "max mus" -> "max"* "mus"*  (alle Begriffe als Präfix, UND-verknüpft)
+        tokens = re.findall(r"\w+", query or "")
+        return " ".join(f'"{t}"*' for t in tokens)
+
+    @_retry_busy
+    @_locked
     def delete_all_customers(self):
-        self.conn.execute(sql.DELETE_ALL_CUSTOMERS)
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute(sql.DELETE_ALL_CUSTOMERS)
+        self.clear_cache()
+        self._emit("reset")
 
+    @_locked
     def close(self):
-        try:
-            self.conn.close()
-        except Exception:
-            pass
\ No newline at end of file
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+            except Exception:
+                pass
+        for conn in (self._version_conn, self.conn):
+            try:
+                conn.close()
+            except Exception:
+                pass
\ No newline at end of file
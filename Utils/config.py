@@ -12,7 +12,15 @@ _DEFAULTS: Dict[str, Any] = {
     "app_version": "0.1.0",
     "build_date": "24.09.2025",
     "support_phone": "",
-    "support_email": "sweet.famine@outlook.de"
+    "support_email": "sweet.famine@outlook.de",
+    "virtual_table": True,
+    "table_page_size": 200,
+    "customer_cache_size": 1024,
+    "reader_pool_size": 4,
+    "search_debounce_ms": 250,
+    "perf_enabled": False,
+    "perf_window": 2000,
+    "sql_audit": False
 }
 
 class Config:
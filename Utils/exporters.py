@@ -0,0 +1,230 @@
+import csv
+import datetime
+import functools
+import io
+import itertools
+import json
+from json.encoder import encode_basestring
+from xml.sax.saxutils import escape as xml_escape
+from typing import Callable, Dict, Iterable, Optional
+
+from Domain.customer import Customer
+
+# Exporter schreiben aus einem beliebigen Iterable von Kunden (z.B. CustomerManager.iter_customers)
+# und kommen ohne Tk aus, damit sie in Hintergrund-Threads laufen können.
+FIELDS = Customer.__slots__
+
+
+def _peek(customers: Iterable[Customer]):
+    # (erster Kunde oder None, Iterator über alle Kunden)
+    it = iter(customers)
+    first = next(it, None)
+    if first is None:
+        return None, it
+    return first, itertools.chain([first], it)
+
+
+def export_csv(path: str, customers: Iterable[Customer]) -> None:
+    first, customers = _peek(customers)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if first is None:
+            writer.writerow(["Keine Daten"])
+            return
+        writer.writerow(FIELDS)
+        writer.writerows([getattr(c, k) for k in FIELDS] for c in customers)
+
+
+# "    \"feld\": " vorab kodiert; Werte über den C-Encoder (json.dumps mit indent ist reines Python)
+_JSON_KEYS = tuple(f"    {json.dumps(k)}: " for k in FIELDS)
+
+
+def _json_value(value) -> str:
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def export_json(path: str, customers: Iterable[Customer]) -> None:
+    # Array wird Element für Element geschrieben, gleiches Format wie json.dump(..., indent=2)
+    first, customers = _peek(customers)
+    with open(path, "w", encoding="utf-8") as f:
+        if first is None:
+            json.dump({"info": "Keine Daten"}, f, ensure_ascii=False, indent=2)
+            return
+        f.write("[")
+        sep = "\n  {\n"
+        for c in customers:
+            f.write(sep)
+            f.write(",\n".join(key + _json_value(getattr(c, field)) for key, field in zip(_JSON_KEYS, FIELDS)))
+            sep = "\n  },\n  {\n"
+        f.write("\n  }\n]")
+
+
+# Excel-Grenze je Blatt (inkl. Kopfzeile), danach geht es auf einem neuen Blatt weiter
+EXCEL_MAX_ROWS = 1_048_576
+DATE_FIELDS = ("date", "birthDate")
+
+
+def export_excel(path: str, customers: Iterable[Customer], rows_per_sheet: int = EXCEL_MAX_ROWS - 1) -> None:
+    # write_only: Zeilen gehen direkt in die Datei, es bleiben keine Zellobjekte im Speicher
+    from openpyxl import Workbook
+    first, customers = _peek(customers)
+    wb = Workbook(write_only=True)
+    if first is None:
+        wb.create_sheet("Kunden").append(["Keine Daten"])
+        wb.save(path)
+        return
+
+    date_columns = [FIELDS.index(f) for f in DATE_FIELDS]
+    ws = None
+    rows = rows_per_sheet
+    for c in customers:
+        if rows >= rows_per_sheet:
+            ws = _new_excel_sheet(wb, len(wb.worksheets) + 1)
+            date_cells = {i: _excel_date_cell(ws) for i in date_columns}
+            rows = 0
+        values = [getattr(c, k) for k in FIELDS]
+        for i in date_columns:
+            # ISO-Datum als echte Excel-Datumszelle, alles andere bleibt Text
+            try:
+                serial = _excel_date_serial(values[i])
+            except (TypeError, ValueError):
+                continue
+            # append() schreibt die Zeile sofort, dieselbe Zelle kann je Spalte wiederverwendet werden
+            date_cells[i].value = serial
+            values[i] = date_cells[i]
+        ws.append(values)
+        rows += 1
+    wb.save(path)
+
+
+def _new_excel_sheet(wb, number):
+    ws = wb.create_sheet("Kunden" if number == 1 else f"Kunden {number}")
+    ws.freeze_panes = "A2"
+    ws.append(list(FIELDS))
+    return ws
+
+
+# Datumswerte wiederholen sich stark; die Umrechnung je Zelle kostete sonst rund 25 % der Exportzeit
+@functools.lru_cache(maxsize=8192)
+def _excel_date_serial(value):
+    from openpyxl.utils.datetime import to_excel
+    return to_excel(datetime.date.fromisoformat(value))
+
+
+def _excel_date_cell(ws):
+    from openpyxl.cell import WriteOnlyCell
+    cell = WriteOnlyCell(ws)
+    cell.number_format = "DD.MM.YYYY"
+    return cell
+
+
+def export_pdf(path: str, customers: Iterable[Customer], on_page: Optional[Callable[[int, None], None]] = None) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+    data = list(customers)
+    doc = SimpleDocTemplate(path, pagesize=A4)
+    if not data:
+        table_data = [["Keine Daten"]]
+    else:
+        table_data = [list(FIELDS)]
+        for c in data:
+            table_data.append([str(getattr(c, k)) for k in FIELDS])
+    table = Table(table_data)
+    table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+    if on_page is None:
+        doc.build([table])
+        return
+    def page_done(canv, doc):
+        on_page(canv.getPageNumber(), None)
+    doc.build([table], onFirstPage=page_done, onLaterPages=page_done)
+
+
+# Word: Tabelle als XML-Text in einem Durchgang direkt in word/document.xml schreiben;
+# python-docx legt nur den Rahmen an (add_row()/cell.text durchlaufen je Zelle den XML-Baum)
+DOCX_PLACEHOLDER = "sweetNote-Tabelle"
+DOCX_FONT_SIZE = 8
+DOCX_CHUNK_ROWS = 1000
+# XML 1.0 erlaubt außer \t und \n keine Steuerzeichen (\r fällt wie bei cell.text weg)
+_XML_INVALID = dict.fromkeys(c for c in range(32) if c not in (9, 10))
+
+
+def export_docx(path: str, customers: Iterable[Customer]) -> None:
+    import zipfile
+    from docx import Document
+    from docx.enum.section import WD_ORIENT
+    from docx.shared import Mm, Pt
+    first, customers = _peek(customers)
+    doc = Document()
+    section = doc.sections[0]
+    section.orientation = WD_ORIENT.LANDSCAPE
+    section.page_width, section.page_height = Mm(297), Mm(210)
+    section.left_margin = section.right_margin = section.top_margin = section.bottom_margin = Mm(12.7)
+    doc.styles["Normal"].font.size = Pt(DOCX_FONT_SIZE)
+    if first is None:
+        doc.add_paragraph("Keine Daten")
+        doc.save(path)
+        return
+
+    doc.add_paragraph(DOCX_PLACEHOLDER)
+    frame = io.BytesIO()
+    doc.save(frame)
+    # Spaltenbreite in Twips (1/20 pt), gleichmäßig wie bei add_table
+    col_width = (section.page_width - section.left_margin - section.right_margin) // 635 // len(FIELDS)
+
+    with zipfile.ZipFile(frame) as src, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            if info.filename != "word/document.xml":
+                dst.writestr(info, src.read(info))
+                continue
+            xml = src.read(info).decode("utf-8")
+            # Platzhalter-Absatz wird durch die Tabelle ersetzt
+            marker = xml.index(DOCX_PLACEHOLDER)
+            start = xml.rindex("<w:p>", 0, marker)
+            end = xml.index("</w:p>", marker) + len("</w:p>")
+            with dst.open("word/document.xml", "w") as out:
+                out.write(xml[:start].encode("utf-8"))
+                out.write(_docx_table_start(col_width).encode("utf-8"))
+                chunk = []
+                for c in customers:
+                    chunk.append(_docx_row([getattr(c, k) for k in FIELDS], col_width))
+                    if len(chunk) >= DOCX_CHUNK_ROWS:
+                        out.write("".join(chunk).encode("utf-8"))
+                        chunk.clear()
+                chunk.append("</w:tbl>")
+                out.write("".join(chunk).encode("utf-8"))
+                out.write(xml[end:].encode("utf-8"))
+
+
+def _docx_table_start(col_width):
+    # Kopfzeile mit tblHeader: Word wiederholt sie auf jeder Seite
+    return ("<w:tbl><w:tblPr><w:tblStyle w:val=\"TableGrid\"/><w:tblW w:type=\"auto\" w:w=\"0\"/>"
+            "<w:tblLook w:firstColumn=\"1\" w:firstRow=\"1\" w:lastColumn=\"0\" w:lastRow=\"0\" "
+            "w:noHBand=\"0\" w:noVBand=\"1\" w:val=\"04A0\"/></w:tblPr><w:tblGrid>"
+            + f"<w:gridCol w:w=\"{col_width}\"/>" * len(FIELDS) + "</w:tblGrid>"
+            + _docx_row(FIELDS, col_width, header=True))
+
+
+def _docx_row(values, col_width, header=False):
+    run_start = "<w:r><w:rPr><w:b/></w:rPr>" if header else "<w:r>"
+    cells = []
+    for value in values:
+        # Zeilenumbrüche und Tabs wie bei cell.text als <w:br/> bzw. <w:tab/>
+        text = xml_escape(str(value).translate(_XML_INVALID))
+        text = text.replace("\t", "</w:t><w:tab/><w:t xml:space=\"preserve\">")
+        text = text.replace("\n", "</w:t><w:br/><w:t xml:space=\"preserve\">")
+        cells.append(f"<w:tc><w:tcPr><w:tcW w:type=\"dxa\" w:w=\"{col_width}\"/></w:tcPr><w:p>"
+                     f"{run_start}<w:t xml:space=\"preserve\">{text}</w:t></w:r></w:p></w:tc>")
+    row_props = "<w:trPr><w:tblHeader/></w:trPr>" if header else ""
+    return f"<w:tr>{row_props}{''.join(cells)}</w:tr>"
+
+
+EXPORTERS: Dict[str, Callable[[str, Iterable[Customer]], None]] = {
+    "xlsx": export_excel,
+    "csv": export_csv,
+    "pdf": export_pdf,
+    "docx": export_docx,
+    "json": export_json,
+}
@@ -0,0 +1,78 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+_WHITESPACE = " \t\r\n"
+# Folgt eins dieser Zeichen auf eine Zahl, war sie am Pufferende abgeschnitten ("-0" aus "-0.5")
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonArrayReader:
+    # Liest ein JSON-Array Element für Element, ohne die ganze Datei zu laden
+    def __init__(self, fp: BinaryIO, chunk_size: int = 64 * 1024):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        raw = self.fp.read(self.chunk_size)
+        self.bytes_read += len(raw)
+        if not raw:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        else:
+            self._buf = self._buf[self._pos:] + self._text.decode(raw)
+        self._pos = 0
+        return True
+
+    def _next_char(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._next_char() != "[":
+            raise ValueError("Ungültiges JSON-Format.")
+        self._pos += 1
+        if self._next_char() == "]":
+            return
+        while True:
+            yield self._decode_value()
+            sep = self._next_char()
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError("Ungültiges JSON-Format.")
+            self._pos += 1
+            self._next_char()
+
+    def _decode_value(self) -> Any:
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Element reicht über das Pufferende hinaus -> nachladen
+                if not self._fill():
+                    raise
+                continue
+            if not self._eof and isinstance(value, (int, float)) and not isinstance(value, bool):
+                # Zahl am Pufferende oder vor ".", "e", Ziffer: erst mit mehr Daten eindeutig
+                if (end == len(self._buf) or self._buf[end] in _NUMBER_CHARS) and self._fill():
+                    continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(fp: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    return iter(JsonArrayReader(fp, chunk_size))
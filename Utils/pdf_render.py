@@ -0,0 +1,301 @@
+import datetime
+import io
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as rl_canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+# Kundenliste als PDF (Querformat A4), ohne Tk: nutzbar aus Fenstern, Benchmarks und Hintergrundprozessen
+PAGE_SIZE = landscape(A4)
+MARGIN_X = 10
+MARGIN_Y = 20
+TITLE = "sweetNote – Patientenverwaltung"
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+FONT_SIZE = 8
+LEADING = 9
+
+# Ab so vielen Zeilen wird direkt auf den Canvas gezeichnet, statt eine Paragraph-Tabelle zu setzen
+FAST_MODE_MIN_ROWS = 500
+# Schneller Modus: längere Zellen werden nach so vielen Zeilen mit "…" gekürzt
+FAST_MAX_LINES = 3
+
+# Zellabstände wie bei reportlab.platypus.Table (Kopfzeile mit BOTTOMPADDING 6)
+_PAD_X = 6
+_PAD_TOP = 3
+_PAD_BOTTOM = 3
+_HEADER_PAD_BOTTOM = 6
+# Frame-Innenabstand von SimpleDocTemplate, Titel: leading 16 + spaceAfter 12
+_FRAME_PAD = 6
+_TITLE_HEIGHT = 16 + 12
+
+
+# Schneller Modus: nach so vielen Seiten geht eine Vorschau der ersten Seiten an on_preview
+PREVIEW_PAGES = 3
+
+
+def render_table_pdf(target, columns, rows, fast=None, on_page=None, on_preview=None):
+    # target: Dateipfad oder Datei-Objekt; fast=None wählt den Modus nach Zeilenzahl
+    # on_page(seite, zeilen_fertig oder None) nach jeder Seite, on_preview(pdf_bytes) mit den ersten Seiten
+    if fast is None:
+        fast = len(rows) >= FAST_MODE_MIN_ROWS
+    if fast:
+        _render_fast(target, columns, rows, on_page, on_preview)
+    else:
+        _render_platypus(target, columns, rows, on_page)
+
+
+def column_widths(columns):
+    total_width = PAGE_SIZE[0] - 2 * MARGIN_X
+    id_width = 40
+    date_width = 60
+    geb_width = 60
+    other_cols = len(columns) - 3
+    col_widths = []
+    for col in columns:
+        if col.lower() == "id":
+            col_widths.append(id_width)
+        elif col.lower() in ("date", "datum"):
+            col_widths.append(date_width)
+        elif col.lower().startswith("geb"):
+            col_widths.append(geb_width)
+        else:
+            col_widths.append((total_width - id_width - date_width - geb_width) / other_cols)
+    return col_widths
+
+
+def draw_footer(canv, page_num):
+    text = f"Page {page_num} | Generated {datetime.date.today().strftime('%d.%m.%Y')}"
+    canv.setFont(FONT, 8)
+    canv.setFillColor(colors.grey)
+    canv.drawRightString(PAGE_SIZE[0] - 10, 20, text)
+
+
+def _add_page(canv, doc):
+    draw_footer(canv, canv.getPageNumber())
+
+
+def _render_platypus(target, columns, rows, on_page=None):
+    styles = getSampleStyleSheet()
+
+    header_style = ParagraphStyle(
+        "header",
+        parent=styles["Normal"],
+        alignment=0,
+        fontName=FONT_BOLD,
+        fontSize=FONT_SIZE,
+        leading=LEADING
+    )
+    body_style = ParagraphStyle(
+        "body",
+        parent=styles["Normal"],
+        alignment=0,
+        fontName=FONT,
+        fontSize=FONT_SIZE,
+        leading=LEADING
+    )
+    title_style = ParagraphStyle(
+        "title",
+        parent=styles["Normal"],
+        alignment=1,
+        fontName=FONT_BOLD,
+        fontSize=14,
+        leading=16,
+        spaceAfter=12
+    )
+
+    elements = [Paragraph(TITLE, title_style)]
+
+    header_row = [
+        Paragraph(str(c).replace(" ", "<br/>"), header_style)
+        for c in columns
+    ]
+
+    data = [header_row]
+    for row in rows:
+        data.append([Paragraph(str(c), body_style) for c in row])
+
+    table = Table(data, colWidths=column_widths(columns), repeatRows=1)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("FONTNAME", (0, 0), (-1, 0), FONT_BOLD),
+        ("FONTSIZE", (0, 0), (-1, -1), FONT_SIZE),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), _HEADER_PAD_BOTTOM),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.whitesmoke),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.black),
+    ]))
+
+    elements.append(table)
+
+    doc = SimpleDocTemplate(
+        target,
+        pagesize=PAGE_SIZE,
+        leftMargin=MARGIN_X,
+        rightMargin=MARGIN_X,
+        topMargin=MARGIN_Y,
+        bottomMargin=MARGIN_Y
+    )
+    add_page = _add_page
+    if on_page is not None:
+        def add_page(canv, doc):
+            _add_page(canv, doc)
+            on_page(canv.getPageNumber(), None)
+    doc.build(elements, onFirstPage=add_page, onLaterPages=add_page)
+
+
+# ==== schneller Modus: eigener Seitenumbruch, Text vorab vermessen ====
+@lru_cache(maxsize=65536)
+def _text_width(text):
+    return stringWidth(text, FONT, FONT_SIZE)
+
+
+def _fit_chars(text, width):
+    # Länge des längsten Präfixes, das in width passt
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _text_width(text[:mid]) <= width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _ellipsize(text, width):
+    if _text_width(text + "…") <= width:
+        return text + "…"
+    return text[:_fit_chars(text, width - _text_width("…"))] + "…"
+
+
+@lru_cache(maxsize=65536)
+def _fit_lines(text, width):
+    # Umbruch wie bei Paragraph: an Leerzeichen, zu breite Wörter füllen die Zeile auf und werden hart getrennt
+    if _text_width(text) <= width:
+        return (text,)
+    lines = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if _text_width(candidate) <= width:
+            line = candidate
+            continue
+        if _text_width(word) <= width:
+            lines.append(line)
+            line = word
+            continue
+        prefix = f"{line} " if line else ""
+        while _text_width(prefix + word) > width:
+            cut = _fit_chars(word, width - _text_width(prefix))
+            if cut == 0 and prefix:
+                lines.append(line)
+                prefix = ""
+                continue
+            cut = max(cut, 1)
+            lines.append(prefix + word[:cut])
+            prefix = ""
+            word = word[cut:]
+        line = prefix + word
+    if line:
+        lines.append(line)
+    if len(lines) > FAST_MAX_LINES:
+        lines = lines[:FAST_MAX_LINES]
+        lines[-1] = _ellipsize(lines[-1], width)
+    return tuple(lines)
+
+
+def _render_fast(target, columns, rows, on_page=None, on_preview=None):
+    page_w, page_h = PAGE_SIZE
+    widths = column_widths(columns)
+    xs = [MARGIN_X]
+    for w in widths:
+        xs.append(xs[-1] + w)
+    text_widths = [w - 2 * _PAD_X for w in widths]
+    header_lines = [str(c).split(" ") for c in columns]
+    header_height = max(len(lines) for lines in header_lines) * LEADING + _PAD_TOP + _HEADER_PAD_BOTTOM
+    top = page_h - MARGIN_Y - _FRAME_PAD
+    bottom = MARGIN_Y + _FRAME_PAD
+
+    canv = rl_canvas.Canvas(target, pagesize=PAGE_SIZE)
+    page_num = 0
+    page_rows = []  # (Zellzeilen je Spalte, Zeilenhöhe) der aktuellen Seite
+    rows_done = 0
+
+    def flush(table_top):
+        nonlocal page_num
+        page_num += 1
+        if page_num == 1:
+            canv.setFont(FONT_BOLD, 14)
+            canv.setFillColor(colors.black)
+            canv.drawCentredString(page_w / 2, top - 14, TITLE)
+        # Hintergründe
+        body_height = sum(h for _cells, h in page_rows)
+        canv.setFillColor(colors.lightgrey)
+        canv.rect(xs[0], table_top - header_height, xs[-1] - xs[0], header_height, stroke=0, fill=1)
+        canv.setFillColor(colors.whitesmoke)
+        canv.rect(xs[0], table_top - header_height - body_height, xs[-1] - xs[0], body_height, stroke=0, fill=1)
+        canv.setFillColor(colors.black)
+
+        # Text: ein Textobjekt pro Seite statt drawString je Zelle
+        text = canv.beginText()
+        text.setFont(FONT_BOLD, FONT_SIZE)
+        for x, lines in zip(xs, header_lines):
+            y = table_top - _PAD_TOP - FONT_SIZE
+            for line in lines:
+                text.setTextOrigin(x + _PAD_X, y)
+                text.textOut(line)
+                y -= LEADING
+        text.setFont(FONT, FONT_SIZE)
+        y_row = table_top - header_height
+        lines_y = [table_top, y_row]
+        for cells, height in page_rows:
+            for x, lines in zip(xs, cells):
+                # VALIGN MIDDLE, Grundlinie wie bei Paragraph eine Schriftgröße unter der Oberkante
+                y = y_row - _PAD_TOP - (height - _PAD_TOP - _PAD_BOTTOM - len(lines) * LEADING) / 2 - FONT_SIZE
+                for line in lines:
+                    text.setTextOrigin(x + _PAD_X, y)
+                    text.textOut(line)
+                    y -= LEADING
+            y_row -= height
+            lines_y.append(y_row)
+        canv.drawText(text)
+
+        # Gitter
+        canv.setLineWidth(0.25)
+        canv.setStrokeColor(colors.black)
+        grid = [(xs[0], y, xs[-1], y) for y in lines_y]
+        grid += [(x, table_top, x, y_row) for x in xs]
+        canv.lines(grid)
+
+        draw_footer(canv, page_num)
+        canv.showPage()
+        page_rows.clear()
+
+        if on_page is not None:
+            on_page(page_num, rows_done)
+        if on_preview is not None and page_num == PREVIEW_PAGES and rows_done < len(rows):
+            # Die ersten Seiten getrennt setzen (geht schnell), damit die Vorschau nicht auf das Ende warten muss
+            preview = io.BytesIO()
+            _render_fast(preview, columns, rows[:rows_done])
+            on_preview(preview.getvalue())
+
+    table_top = top - _TITLE_HEIGHT
+    y = table_top - header_height
+    for row in rows:
+        cells = [_fit_lines(" ".join(str(value).split()), width) for value, width in zip(row, text_widths)]
+        height = max(len(lines) for lines in cells) * LEADING + _PAD_TOP + _PAD_BOTTOM
+        if y - height < bottom and page_rows:
+            flush(table_top)
+            table_top = top
+            y = table_top - header_height
+        page_rows.append((cells, height))
+        rows_done += 1
+        y -= height
+    flush(table_top)
+    canv.save()
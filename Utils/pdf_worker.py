@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import queue
+
+# PDFs in einem eigenen Prozess bauen: reportlab ist reine CPU-Arbeit, ein Thread würde die Oberfläche
+# über den GIL trotzdem ausbremsen. "spawn" überall, fork verträgt sich nicht mit Tk und laufenden Threads.
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _build(messages, builder, path, args, progressive):
+    # Läuft im Kindprozess; builder muss eine Modulfunktion sein (wird per Name übertragen)
+    def on_page(page, rows_done):
+        messages.put(("page", page, rows_done))
+
+    def on_preview(data):
+        messages.put(("preview", data))
+
+    try:
+        kwargs = {"on_page": on_page}
+        if progressive:
+            kwargs["on_preview"] = on_preview
+        builder(path, *args, **kwargs)
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+    else:
+        messages.put(("done",))
+
+
+class PdfBuildJob:
+    # builder(path, *args, on_page=..., [on_preview=...]) schreibt das PDF nach path.
+    # poll() regelmäßig aus dem Tk- oder Export-Thread aufrufen, cancel() beendet den Prozess sofort.
+    def __init__(self, builder, path, *args, progressive=False):
+        self.path = path
+        self.pages = 0
+        self.rows_done = None
+        self.preview = None
+        self.error = None
+        self.finished = False
+        self.cancelled = False
+        self._messages = _CONTEXT.Queue()
+        self._process = _CONTEXT.Process(target=_build, args=(self._messages, builder, path, args, progressive),
+                                         name="sweetNote-pdf", daemon=True)
+
+    def start(self):
+        self._process.start()
+
+    def poll(self):
+        # Nachrichten abholen; True, sobald der Prozess fertig ist
+        if self.finished:
+            return True
+        self._read_messages()
+        if not self.finished and not self._process.is_alive():
+            # Der Prozess kann "done" kurz vor dem Ende geschickt haben
+            self._read_messages()
+            if not self.finished:
+                self.error = f"PDF-Prozess unerwartet beendet (Code {self._process.exitcode})"
+                self.finished = True
+        if self.finished:
+            self._process.join()
+            self._messages.close()
+        return self.finished
+
+    def _read_messages(self):
+        while not self.finished:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return
+            kind = message[0]
+            if kind == "page":
+                self.pages = message[1]
+                if message[2] is not None:
+                    self.rows_done = message[2]
+            elif kind == "preview":
+                self.preview = message[1]
+            elif kind == "error":
+                self.error = message[1]
+                self.finished = True
+            elif kind == "done":
+                self.finished = True
+
+    def cancel(self):
+        if self.finished:
+            return
+        self.cancelled = True
+        self.finished = True
+        self._process.terminate()
+        self._process.join(2)
+        self._messages.close()
+        # Halbfertige Datei nicht liegen lassen
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
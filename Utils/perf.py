@@ -0,0 +1,228 @@
+import contextlib
+import csv
+import datetime
+import functools
+import inspect
+import json
+import platform
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Laufzeitmessung für Hot Paths (Manager-Methoden, SQL, UI-Aktionen).
+# Wird beim Start über config.json ("perf_enabled") eingeschaltet; ausgeschaltet gibt es keine
+# Wrapper und keine eigene Connection-Klasse, nur die Prüfung in timed()/start().
+WINDOW = 2000  # je Operation die letzten n Messwerte für p50/p95
+
+_enabled = False
+_window = WINDOW
+_stats = {}
+_lock = threading.Lock()
+
+
+class OpStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+
+def enable(window=WINDOW):
+    global _enabled, _window
+    _window = max(10, int(window))
+    _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, seconds):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = OpStats(_window)
+        stats.count += 1
+        stats.total += seconds
+        if seconds > stats.max:
+            stats.max = seconds
+        stats.samples.append(seconds)
+
+
+@contextlib.contextmanager
+def timed(name):
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def start(name):
+    # Für Abläufe über mehrere Callbacks (z.B. Suche bis zum letzten Block): stop(token) am Ende
+    return (name, time.perf_counter()) if _enabled else None
+
+
+def stop(token):
+    if token is not None:
+        record(token[0], time.perf_counter() - token[1])
+
+
+def timed_function(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start_time)
+        return wrapper
+    return decorator
+
+
+def instrument(obj, prefix, skip=()):
+    # Öffentliche Methoden von obj auf der Instanz durch gemessene Versionen ersetzen.
+    # Generatoren (iter_*) zählen mit der Zeit aller Blöcke bis zum Ende bzw. close().
+    if not _enabled:
+        return obj
+    for attr, method in inspect.getmembers(obj, inspect.ismethod):
+        if attr.startswith("_") or attr in skip:
+            continue
+        setattr(obj, attr, _timed_method(f"{prefix}.{attr}", method))
+    return obj
+
+
+def _timed_method(name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            record(name, time.perf_counter() - start_time)
+            raise
+        if inspect.isgenerator(result):
+            return _timed_iter(name, result, time.perf_counter() - start_time)
+        record(name, time.perf_counter() - start_time)
+        return result
+    return wrapper
+
+
+def _timed_iter(name, iterator, elapsed=0.0):
+    try:
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start_time
+            yield item
+    finally:
+        iterator.close()
+        record(name, elapsed)
+
+
+# ==== SQL ====
+@functools.lru_cache(maxsize=512)
+def _sql_label(stmt):
+    # Spaltenlisten weglassen, damit sich die Anweisungen am WHERE/ORDER BY unterscheiden lassen
+    text = re.sub(r"\s+", " ", stmt).strip()
+    text = re.sub(r"^SELECT (?!COUNT).*? FROM ", "SELECT … FROM ", text, flags=re.I)
+    text = re.sub(r"\([^()]*\)", "(…)", text)
+    return "sql " + (text if len(text) <= 90 else text[:89] + "…")
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, stmt, *args):
+        with timed(_sql_label(stmt)):
+            return super().execute(stmt, *args)
+
+    def executemany(self, stmt, *args):
+        with timed(_sql_label(stmt)):
+            return super().executemany(stmt, *args)
+
+    def fetchall(self):
+        with timed("sql fetchall"):
+            return super().fetchall()
+
+    def fetchmany(self, *args):
+        with timed("sql fetchmany"):
+            return super().fetchmany(*args)
+
+
+class TimedConnection(sqlite3.Connection):
+    # Connection.execute() geht intern nicht über cursor(), daher beides überschreiben
+    def cursor(self, factory=None):
+        return super().cursor(factory or TimedCursor)
+
+    def execute(self, stmt, *args):
+        return self.cursor().execute(stmt, *args)
+
+    def executemany(self, stmt, *args):
+        return self.cursor().executemany(stmt, *args)
+
+
+def connection_factory():
+    # Für sqlite3.connect(..., factory=...)
+    return TimedConnection if _enabled else sqlite3.Connection
+
+
+# ==== Auswertung ====
+def _percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))]
+
+
+def snapshot():
+    # Eine Zeile je Operation, langsamste Gesamtzeit zuerst; Zeiten in ms
+    with _lock:
+        items = [(name, s.count, s.total, s.max, sorted(s.samples)) for name, s in _stats.items()]
+    rows = []
+    for name, count, total, max_time, samples in items:
+        rows.append({
+            "operation": name,
+            "count": count,
+            "p50_ms": round(_percentile(samples, 0.5) * 1000, 3),
+            "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+            "max_ms": round(max_time * 1000, 3),
+            "total_ms": round(total * 1000, 1),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def export(path):
+    # .csv als Tabelle, sonst JSON mit Systemangaben (für Support-Anfragen)
+    rows = snapshot()
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["operation", "count", "p50_ms", "p95_ms", "max_ms", "total_ms"])
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "window": _window,
+            "operations": rows,
+        }, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,63 @@
+import functools
+import unicodedata
+
+# Kölner Phonetik: ähnlich klingende deutsche Namen bekommen denselben Ziffern-Code
+# (Meier/Meyer/Maier -> 67, Schmidt/Schmitt -> 862, Müller-Lüdenscheidt -> 65752682).
+# Nicht-Buchstaben werden ignoriert, Umlaute/Akzente auf den Grundbuchstaben abgebildet.
+_VOWELS = frozenset("AEIJOUY")
+_C_HARD_START = frozenset("AHKLOQRUX")
+_C_HARD = frozenset("AHKOQUX")
+_SIMPLE = {"B": "1", "F": "3", "V": "3", "W": "3", "G": "4", "K": "4", "Q": "4",
+           "L": "5", "M": "6", "N": "6", "R": "7", "S": "8", "Z": "8"}
+
+
+def _letters(text):
+    text = unicodedata.normalize("NFKD", (text or "").upper())
+    return [c for c in text if "A" <= c <= "Z"]
+
+
+def _code(letters, i):
+    c = letters[i]
+    prev = letters[i - 1] if i else None
+    nxt = letters[i + 1] if i + 1 < len(letters) else None
+    if c in _VOWELS:
+        return "0"
+    if c in _SIMPLE:
+        return _SIMPLE[c]
+    if c == "P":
+        return "3" if nxt == "H" else "1"
+    if c in "DT":
+        return "8" if nxt in ("C", "S", "Z") else "2"
+    if c == "C":
+        if prev is None:
+            return "4" if nxt in _C_HARD_START else "8"
+        return "4" if nxt in _C_HARD and prev not in ("S", "Z") else "8"
+    if c == "X":
+        return "8" if prev in ("C", "K", "Q") else "48"
+    return ""  # H
+
+
+# Namen wiederholen sich stark (Import, Suche): Codes zwischenspeichern
+@functools.lru_cache(maxsize=8192)
+def koelner_phonetik(text):
+    letters = _letters(text)
+    digits = []
+    for i in range(len(letters)):
+        for digit in _code(letters, i):
+            if not digits or digits[-1] != digit:
+                digits.append(digit)
+    # Nullen (Vokale) zählen nur am Anfang
+    return "".join(d for i, d in enumerate(digits) if d != "0" or i == 0)
+
+
+def edit_distance(a, b):
+    # Levenshtein-Distanz, zeilenweise mit O(len(b)) Speicher
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
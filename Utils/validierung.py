@@ -31,4 +31,11 @@ def fmt_de_date(value: str) -> str:
     try:
         return datetime.strptime(value, "%Y-%m-%d").strftime("%d.%m.%Y")
     except Exception:
-        return value
\ No newline at end of file
+        return value
+
+def to_iso_date(value):
+    # TT.MM.JJJJ -> JJJJ-MM-TT für die DB; Unbekanntes bleibt unverändert
+    if not isinstance(value, str):
+        return value
+    d = parse_de_date(value)
+    return d.isoformat() if d else value